@@ -276,17 +276,11 @@ class ColorInput(TextInput):  # lgtm [py/missing-call-to-init]
                 format_color = '#'
             else:
                 # Remove all invalid chars
-                valid_text = ''
-                for ch in text:
-                    if ch in self._valid_chars:
-                        valid_text += ch
-                text = valid_text
+                valid_chars = self._valid_chars_set
+                text = ''.join([ch for ch in text if ch in valid_chars])
 
                 # Check if the color is valid
-                count_hash = 0
-                for ch in text:
-                    if ch == '#':
-                        count_hash += 1
+                count_hash = text.count('#')
                 if count_hash == 1:
                     assert text[0] == '#', 'color format must be "#RRGGBB"'
                 if count_hash == 0:
@@ -444,7 +438,7 @@ class ColorInput(TextInput):  # lgtm [py/missing-call-to-init]
                     # Verify only on user key input, the rest of events are checked
                     # by TextInput on super call
                     key = str(event.unicode)
-                    if key in self._valid_chars:
+                    if key in self._valid_chars_set:
                         new_string = (
                                 self._input_string[:self._cursor_position]
                                 + key
@@ -517,7 +511,7 @@ class ColorInput(TextInput):  # lgtm [py/missing-call-to-init]
                     # Verify only on user key input, the rest of events are checked
                     # by TextInput on super call
                     key = str(event.unicode)
-                    if key in self._valid_chars:
+                    if key in self._valid_chars_set:
                         if key == '#':
                             return True
                         if cursor_pos == 0:
@@ -17,6 +17,9 @@ import pygame_menu
 import pygame_menu.controls as ctrl
 
 from abc import ABC
+from bisect import bisect_left
+from functools import lru_cache, partial
+from itertools import accumulate
 from pygame_menu.locals import FINGERDOWN, FINGERUP, INPUT_INT, INPUT_FLOAT, INPUT_TEXT
 from pygame_menu.utils import check_key_pressed_valid, make_surface, assert_color, \
     get_finger_pos, warn, assert_vector
@@ -25,7 +28,7 @@ from pygame_menu.widgets.core.widget import Widget, WidgetTransformationNotImple
 
 from pygame_menu._types import Optional, Any, CallbackType, Tuple, List, ColorType, \
     NumberType, Tuple2IntType, Dict, Tuple2NumberType, NumberInstance, ColorInputType, \
-    EventVectorType, Union, Callable
+    EventVectorType, Union, Callable, FrozenSet, Tuple3IntType, EventType, Tuple2BoolType
 
 try:
     # noinspection PyProtectedMember
@@ -40,11 +43,59 @@ except (ModuleNotFoundError, ImportError):
         Pyperclip exception thrown by pyperclip.
         """
 
-CTRL_KMOD = (
+CTRL_KMOD = frozenset((
     pygame.KMOD_CTRL, pygame.KMOD_CTRL | pygame.KMOD_CAPS,
     pygame.KMOD_LCTRL, pygame.KMOD_LCTRL | pygame.KMOD_CAPS,
     pygame.KMOD_RCTRL, pygame.KMOD_RCTRL | pygame.KMOD_CAPS
-)
+))
+
+# Translation table that deletes the escape chars
+_ESCAPE_TABLE = dict.fromkeys(range(1, 32))
+
+# Chars of a plain number, used to validate numeric input without parsing it
+_ASCII_DIGITS = frozenset('0123456789')
+
+# Conversion used to validate each numeric input type
+_INPUT_TYPE_CONV = {INPUT_FLOAT: float, INPUT_INT: int}
+
+# Controller events checked on key press, and the default Controller events.
+# These only compare the key, thus, if not overridden, a key table is used
+_CTRL_KEYDOWN_EVENTS = frozenset((
+    'back', 'delete', 'right', 'left', 'move_up', 'move_down', 'end', 'home',
+    'tab', 'apply', 'escape'
+))
+_CTRL_KEYDOWN_DEFAULTS = tuple((name, getattr(ctrl.Controller, name))
+                               for name in sorted(_CTRL_KEYDOWN_EVENTS))
+
+# Keys that start/stop the text selection
+_SHIFT_KEYS = frozenset((pygame.K_LSHIFT, pygame.K_RSHIFT))
+
+
+@lru_cache(maxsize=2048)
+def _font_size(font: 'pygame.font.Font', text: str) -> Tuple2IntType:
+    """
+    Return the size of the given text using the font. The result is cached, thus,
+    the measurements are shared by all the widgets that use the same font object.
+
+    :param font: Font object
+    :param text: Text to measure
+    :return: Text size (width, height) in px
+    """
+    return font.size(text)
+
+
+@lru_cache(maxsize=2048)
+def _font_render_size(font: 'pygame.font.Font', text: str, antialias: bool) -> Tuple2IntType:
+    """
+    Return the size of the surface obtained by rendering the text with the font.
+    The rendered surface is not stored, only its size.
+
+    :param font: Font object
+    :param text: Text to render
+    :param antialias: Font antialias
+    :return: Surface size (width, height) in px
+    """
+    return font.render(text, antialias, (0, 0, 0)).get_size()
 
 
 # noinspection PyMissingOrEmptyDocstring
@@ -102,11 +153,9 @@ class TextInput(Widget):
     _alt_x_enabled: bool
     _apply_widget_update_callback: bool  # Used in ColorInput
     _block_copy_paste: bool
-    _clock: 'pygame.time.Clock'
     _copy_paste_enabled: bool
     _current_underline_string: str  # Testing
     _cursor_color: ColorType
-    _cursor_ms_counter: NumberType  # Stores the ms between cursor switch
     _cursor_offset: NumberType
     _cursor_position: int
     _cursor_render: bool
@@ -114,14 +163,16 @@ class TextInput(Widget):
     _cursor_surface: Optional['pygame.Surface']
     _cursor_surface_pos: List[int]
     _cursor_switch_ms: NumberType
-    _cursor_visible: bool
+    _cursor_visible_last: bool
+    _cursor_visible_ticks: int  # Ticks where the cursor blink started visible
     _ellipsis: str
     _ellipsis_size: NumberType
+    _event_handlers: Dict[int, Callable[[EventType, 'pygame.Rect', int], Tuple2BoolType]]
     _history: List[str]
     _history_cursor: List[int]
     _history_index: int
-    _history_renderbox: List[List[int]]
-    _ignore_keys: Tuple[int, ...]
+    _history_renderbox: List[Tuple3IntType]
+    _ignore_keys: FrozenSet[int]
     _input_string: str
     _input_type: str
     _input_underline: str
@@ -130,13 +181,19 @@ class TextInput(Widget):
     _input_underline_vmargin: int
     _key_is_pressed: bool
     _keychar_size: Dict[str, NumberType]
-    _keyrepeat_counters: Dict[int, List[int]]
+    _keydown_actions: Tuple[Tuple[str, Callable[[], Tuple2BoolType]], ...]
+    _keydown_table: Optional[Dict[int, Callable[[], Tuple2BoolType]]]
+    _cursor_mouse_thresholds: Tuple[Optional[str], List[NumberType]]
+    _keyrepeat_counters: Dict[int, int]
     _keyrepeat_initial_interval_ms: NumberType
     _keyrepeat_interval_ms: NumberType
+    _keyrepeat_unicode: Dict[int, str]
     _keyrepeat_mouse_interval_ms: NumberType
     _keyrepeat_mouse_ms: NumberType
     _last_char: str
     _last_container_width: int
+    _last_overlay_hash: int
+    _last_update_ticks: int
     _last_key: int
     _last_selection_render: List[int]
     _maxchar: int
@@ -147,6 +204,7 @@ class TextInput(Widget):
     _mouse_is_pressed: bool
     _password: bool
     _password_char: str
+    _password_string_cache: Tuple[Optional[Tuple[str, int]], str]
     _renderbox: List[int]
     _selection_active: bool
     _selection_box: List[int]
@@ -155,8 +213,14 @@ class TextInput(Widget):
     _selection_mouse_first_position: int
     _selection_position: List[int]
     _selection_surface: Optional['pygame.Surface']
+    _selection_surface_buffer: Optional['pygame.Surface']
+    _string_surface_cache: Tuple[Optional[Tuple[Any, ...]], Optional['pygame.Surface']]
+    _title_height: NumberType
     _title_size: NumberType
-    _valid_chars: Optional[List[str]]
+    _underline_surface_cache: Tuple[Optional[Tuple[Any, ...]], Optional['pygame.Surface']]
+    _valid_chars_list: Optional[List[str]]
+    _valid_chars_set: Optional[FrozenSet[str]]
+    _value_cache: Tuple[Optional[Tuple[str, str]], Union[str, int, float]]
 
     def __init__(
             self,
@@ -254,7 +318,7 @@ class TextInput(Widget):
         )
 
         self._input_string = ''
-        self._ignore_keys = (  # Ignore keys on keyrepeat event
+        self._ignore_keys = frozenset((  # Ignore keys on keyrepeat event
             ctrl.KEY_MOVE_DOWN,
             ctrl.KEY_MOVE_UP,
             ctrl.KEY_TAB,
@@ -268,16 +332,43 @@ class TextInput(Widget):
             pygame.K_RCTRL,
             pygame.K_RETURN,
             pygame.K_RSHIFT
-        )
+        ))
 
         # Vars to make keydown repeat after user pressed a key for some time:
         self._block_copy_paste = False  # Blocks event
         self._key_is_pressed = False
-        self._keyrepeat_counters = {}  # {event.key: (counter_int, event.unicode)} (look for "***")
+        self._keyrepeat_counters = {}  # {event.key: counter_int} (look for "***")
         self._keyrepeat_initial_interval_ms = repeat_keys_initial_ms
         self._keyrepeat_interval_ms = repeat_keys_interval_ms
+        self._keyrepeat_unicode = {}  # {event.key: event.unicode}
         self._last_key = 0
 
+        # Actions of the controller events on key press, in order of precedence
+        self._keydown_actions = (
+            ('back', self._keydown_back),
+            ('delete', self._keydown_delete),
+            ('right', self._keydown_right),
+            ('left', self._keydown_left),
+            ('move_up', self._keydown_move),
+            ('move_down', self._keydown_move),
+            ('end', partial(self._jump_cursor, False)),
+            ('home', partial(self._jump_cursor, True)),
+            ('tab', self._keydown_tab),
+            ('apply', self._keydown_apply),
+            ('escape', self._keydown_escape)
+        )
+        self._update_keydown_table()
+
+        # Event handlers, the event type is looked up instead of testing each one
+        self._event_handlers = {
+            pygame.KEYDOWN: self._handle_keydown,
+            pygame.KEYUP: self._handle_keyup,
+            pygame.MOUSEBUTTONDOWN: self._handle_mouse,
+            pygame.MOUSEBUTTONUP: self._handle_mouse,
+            FINGERDOWN: self._handle_mouse,
+            FINGERUP: self._handle_mouse
+        }
+
         # Mouse handling
         self._keyrepeat_mouse_ms = 0
         self._keyrepeat_mouse_interval_ms = repeat_mouse_interval_ms
@@ -289,9 +380,7 @@ class TextInput(Widget):
         self._renderbox = [0, 0, 0]  # Left/Right/Inner, int
 
         # Things cursor:
-        self._clock = pygame.time.Clock()
         self._cursor_color = cursor_color
-        self._cursor_ms_counter = 0
         self._cursor_offset = -1.0
         self._cursor_position = 0  # Inside text
         self._cursor_render = True  # If True cursor must be rendered
@@ -299,6 +388,8 @@ class TextInput(Widget):
         self._cursor_surface_pos = [0, 0]  # Position (x,y) of surface
         self._cursor_size = cursor_size
         self._cursor_switch_ms = cursor_switch_ms
+        self._cursor_visible_last = False
+        self._cursor_visible_ticks = 0
         self._cursor_visible = False  # Switches every self._cursor_switch_ms ms
 
         # History of editions
@@ -318,6 +409,7 @@ class TextInput(Widget):
         self._selection_mouse_first_position = -1
         self._selection_position = [0, 0]  # x,y (float)
         self._selection_surface = None
+        self._selection_surface_buffer = None
 
         # List of valid chars
         if valid_chars is not None:
@@ -331,6 +423,7 @@ class TextInput(Widget):
             assert len(valid_chars) > 0, \
                 'valid_chars list must contain at least 1 element'
         self._valid_chars = valid_chars
+        self._value_cache = (None, '')
 
         # Callbacks
         self._apply_widget_update_callback = True
@@ -346,8 +439,11 @@ class TextInput(Widget):
         self._input_underline_size = 0
         self._input_underline_vmargin = input_underline_vmargin
         self._keychar_size = {'': 0}
+        self._cursor_mouse_thresholds = (None, [])
         self._last_char = ''
         self._last_container_width = 0
+        self._last_overlay_hash = 0
+        self._last_update_ticks = pygame.time.get_ticks()
         self._maxchar = maxchar
         self._maxwidth = maxwidth  # This value will be changed depending on how many chars are printed
         self._maxwidth_base = maxwidth
@@ -355,31 +451,60 @@ class TextInput(Widget):
         self._maxwidthsize = 0  # Updated in _apply_font()
         self._password = password
         self._password_char = password_char
+        self._password_string_cache = (None, '')
+        self._title_height = 0
         self._title_size = 0
 
+        # Last rendered surfaces, stored as (key, surface)
+        self._string_surface_cache = (None, None)
+        self._underline_surface_cache = (None, None)
+
     def _apply_font(self) -> None:
-        self._ellipsis_size = self._font.size(self._ellipsis)[0]
-        self._title_size = self._font.size(self._title)[0]
+        self._keychar_size = {'': 0}
+        self._cursor_mouse_thresholds = (None, [])
+        self._ellipsis_size = _font_size(self._font, self._ellipsis)[0]
+        self._title_size, self._title_height = _font_size(self._font, self._title)
 
         # Generate the underline surface
-        self._input_underline_size = self._font.size(self._input_underline * 3)[0] / 3
+        self._input_underline_size = _font_size(self._font, self._input_underline * 3)[0] / 3
 
         # Size of maxwidth if not zero
         max_char = 'O'
         if self._password:
             max_char = self._password_char
-        max_char_size = self._font_render_string(max_char * self._maxwidth_base).get_size()
-        self._maxwidthsize = max_char_size[0]
+        self._maxwidthsize = self._font_render_width(max_char * self._maxwidth_base)
 
         # Update password char size
         if self._password:
-            password_size = self._font_render_string(self._password_char).get_size()[0]
+            password_size = self._font_render_width(self._password_char)
             if password_size == 0:
                 raise ValueError(
                     'password character is not valid, the size of the font is zero, '
                     'use another character or change the font')
             self._keychar_size[self._password_char] = password_size
 
+        # The font changed, thus, the rendered surfaces are not valid anymore
+        self._string_surface_cache = (None, None)
+        self._underline_surface_cache = (None, None)
+
+    def _force_render(self) -> Optional[bool]:
+        self._string_surface_cache = (None, None)
+        self._underline_surface_cache = (None, None)
+        return super(TextInput, self)._force_render()
+
+    def _font_render_width(self, text: str) -> int:
+        """
+        Return the width of the text rendered by the widget font. This is equivalent
+        to ``_font_render_string(text).get_width()``, but the measurement is cached.
+
+        :param text: Text to measure
+        :return: Text width in px
+        """
+        if self._font is None:
+            return 0
+        text = text.replace('\t', ' ' * self._tab_size)
+        return _font_render_size(self._font, text, self._font_antialias)[0]
+
     def clear(self) -> None:
         """
         Clear the current text.
@@ -396,10 +521,15 @@ class TextInput(Widget):
 
         :return: Text inside the widget
         """
-        value = ''
         if self._input_type == INPUT_TEXT:
-            value = self._input_string  # Without filters
-        elif self._input_type == INPUT_FLOAT:
+            return self._input_string  # Without filters
+
+        # Numeric values are parsed only if the input changed
+        key = (self._input_type, self._input_string)
+        if self._value_cache[0] == key:
+            return self._value_cache[1]
+        value = ''
+        if self._input_type == INPUT_FLOAT:
             try:
                 value = float(self._input_string)
             except ValueError:
@@ -409,8 +539,28 @@ class TextInput(Widget):
                 value = int(float(self._input_string))
             except ValueError:
                 value = 0
+        self._value_cache = (key, value)
         return value
 
+    @property
+    def _valid_chars(self) -> Optional[List[str]]:
+        """
+        Return the list of valid chars.
+
+        :return: Valid chars, ``None`` if all chars are valid
+        """
+        return self._valid_chars_list
+
+    @_valid_chars.setter
+    def _valid_chars(self, valid_chars: Optional[List[str]]) -> None:
+        """
+        Set the list of valid chars. A set is also stored for membership checks.
+
+        :param valid_chars: Valid chars, ``None`` if all chars are valid
+        """
+        self._valid_chars_list = valid_chars
+        self._valid_chars_set = None if valid_chars is None else frozenset(valid_chars)
+
     def scale(self, *args, **kwargs) -> 'TextInput':
         raise WidgetTransformationNotImplemented()
 
@@ -431,17 +581,16 @@ class TextInput(Widget):
         return self
 
     def _draw(self, surface: 'pygame.Surface') -> None:
+        draws = [(self._surface, (self._rect.x, self._rect.y))]  # Draw string
+
         # Draw selection surface
-        if pygame.vernum[0] >= 2:  # pygame 1.9.3 don't have vernum.major
-            surface.blit(self._surface, (self._rect.x, self._rect.y))  # Draw string
-            if self._selection_surface is not None:  # Draw selection
-                surface.blit(self._selection_surface, (self._selection_position[0],
-                                                       self._selection_position[1]))
-        else:
-            if self._selection_surface is not None:  # Draw selection
-                surface.blit(self._selection_surface, (self._selection_position[0],
-                                                       self._selection_position[1]))
-            surface.blit(self._surface, (self._rect.x, self._rect.y))  # Draw string
+        if self._selection_surface is not None:
+            selection = (self._selection_surface, (self._selection_position[0],
+                                                   self._selection_position[1]))
+            if pygame.vernum[0] >= 2:  # pygame 1.9.3 don't have vernum.major
+                draws.append(selection)
+            else:
+                draws.insert(0, selection)
 
         # Draw cursor
         if self._selected and self._cursor_surface and \
@@ -451,42 +600,77 @@ class TextInput(Widget):
             if self._flip[0]:  # Flip on x-axis (bug)
                 x = self._surface.get_width() - x
             y = self._rect.y + self._cursor_surface_pos[1]
-            surface.blit(self._cursor_surface, (x, y))
-
-    def _render(self) -> Optional[bool]:
-        string = self._title + self._get_input_string()  # Render string
+            draws.append((self._cursor_surface, (x, y)))
 
-        max_cont_width = self._get_max_container_width()
-        if max_cont_width != 0:
-            self._last_container_width = max_cont_width
+        # Surface.blits is not available on pygame 1.9.3
+        if pygame.vernum[0] >= 2:
+            surface.blits(draws, False)
+        else:
+            for source, dest in draws:
+                surface.blit(source, dest)
 
+    def _render(self) -> Optional[bool]:
+        # The container width is only used to fill it with the underline
+        if self._input_underline_size != 0 and self._input_underline_len == 0:
+            max_cont_width = self._get_max_container_width()
+            if max_cont_width != 0:
+                self._last_container_width = max_cont_width
+
+        # The cursor and the selection are drawn over the string surface, thus,
+        # these only require to update the Menu surface cache. The cursor
+        # visibility (blink) is checked within draw
+        rb0, rb1, rb2 = self._renderbox
+        overlay_hash = self._hash_variables(
+            self._cursor_position, self._selection_enabled, self._selection_active,
+            self._selection_box[0], self._selection_box[1],
+            self._last_selection_render[0], self._last_selection_render[1],
+            rb0, rb1, rb2)
+        # The rendered string is not built to check the hash; instead, the
+        # variables it depends on are used, as str objects cache their hash
         if not self._render_hash_changed(
-                string, self._selected, self._cursor_render, self._cursor_position,
-                self._selection_enabled, self.active, self._visible, self.readonly,
-                self._last_container_width, self._selection_box[0],
-                self._selection_box[1], self._last_selection_render[0],
-                self._last_selection_render[1], self._renderbox[0], self._renderbox[1],
-                self._renderbox[2], self._cursor_visible):
+                self._title, self._input_string, self._password, self._maxwidth,
+                rb0, rb1, self._selected, self.active,
+                self._visible, self.readonly, self._last_container_width):
+            if overlay_hash != self._last_overlay_hash:
+                self._last_overlay_hash = overlay_hash
+                self._render_overlay()
+                self.force_menu_surface_cache_update()
+            elif self._cursor_render:
+                cursor_pos = tuple(self._cursor_surface_pos)
+                self._render_cursor()
+                if cursor_pos != tuple(self._cursor_surface_pos):
+                    self.force_menu_surface_cache_update()
             return True
+        self._last_overlay_hash = overlay_hash
+        string = self._title + self._get_input_string()  # Render string
 
         # Apply underline if exists
         self._surface = self._render_string_underline(string, self.get_font_color_status())
         self._apply_transforms()
-
-        # Render the cursor
-        self._render_cursor()
-
-        # Render the selection box if text is selected
-        self._render_selection_box()
+        self._render_overlay()
 
         # Update last rendered
         self._last_rendered_string = string
 
-        # Update the size of the render
-        self._rect.width, self._rect.height = self._surface.get_size()
+        # Update the size of the render. The Menu only requires to update the
+        # widgets surface if the size changed
+        size = self._surface.get_size()
+        if (self._rect.width, self._rect.height) != size:
+            self._rect.width, self._rect.height = size
+            self.force_menu_surface_update()
+        else:
+            self.force_menu_surface_cache_update()
 
-        # Force Menu update
-        self.force_menu_surface_update()
+    def _render_overlay(self) -> None:
+        """
+        Render the cursor and the selection box, which are drawn over the string.
+        """
+        # Render the cursor, its position depends on the string and the renderbox
+        self._cursor_render = True
+        self._render_cursor()
+
+        # Render the selection box if text is selected
+        self._render_selection_box()
 
     def _render_selection_box(self, force: bool = False) -> None:
         """
@@ -497,62 +681,59 @@ class TextInput(Widget):
         if not self._selection_enabled:
             return
 
+        selection_box = self._selection_box
+        last_selection_render = self._last_selection_render
         if self._selection_active and \
-                (self._last_selection_render[0] != self._selection_box[0] or
-                 self._last_selection_render[1] != self._selection_box[1]) or force:
+                (last_selection_render[0] != selection_box[0] or
+                 last_selection_render[1] != selection_box[1]) or force:
+            renderbox = self._renderbox
 
             # If there's no limit
-            pos = [0, 0]
             if self._maxwidth == 0:
-                pos[0] = self._selection_box[0]
-                pos[1] = self._selection_box[1]
+                pos0, pos1 = selection_box[0], selection_box[1]
             else:
-                pos[0] = max(self._selection_box[0], self._renderbox[0])
-                pos[1] = min(self._selection_box[1], self._renderbox[1])
+                pos0 = max(selection_box[0], renderbox[0])
+                pos1 = min(selection_box[1], renderbox[1])
 
             # Find coordinates of each position
             string = self._get_input_string_filtered()
-            string_init = string[self._renderbox[0]:pos[0]]
-            string_final = string[self._renderbox[0]:pos[1]]
+            title = self._title
+            x1 = self._cursor_offset + _font_size(self._font, title + string[renderbox[0]:pos0])[0]
+            x2 = self._cursor_offset + _font_size(self._font, title + string[renderbox[0]:pos1])[0] + 1
 
-            x1 = self._cursor_offset + self._font.size(self._title + string_init)[0]
-            x2 = self._cursor_offset + self._font.size(self._title + string_final)[0] + 1
-
-            self._last_selection_render[0] = self._selection_box[0]
-            self._last_selection_render[1] = self._selection_box[1]
+            last_selection_render[0] = selection_box[0]
+            last_selection_render[1] = selection_box[1]
 
             x = x2 - x1
             if x <= 1:
                 self._selection_surface = None
                 return
-            y = self._font.size(self._title)[1]
+            y = self._title_height
 
             # Add ellipsis
-            delta = self._ellipsis_size
-            if self._ellipsis_left_and_right():  # If Left+Right ellipsis
-                delta *= 1
-            elif self._ellipsis_right():  # Right ellipsis
-                delta *= 0
-            elif self._ellipsis_left():  # Left ellipsis
-                delta *= 1
-            else:
-                delta *= 0
+            delta = self._ellipsis_delta()
             x1 += delta
             x2 += delta
 
             # Apply scale factor (experimental)
-            x *= self._scale_factor[0]
-            y *= self._scale_factor[1]
-            x1 *= self._scale_factor[0]
-
-            # Create surface and fill
-            self._selection_surface = make_surface(x, y, fill_color=self._selection_color)
-            self._selection_position[0] = x1 + self._rect.x
-            self._selection_position[1] = self._rect.y
-
-            # Fill cursor
-            if self._cursor_surface:
-                self._cursor_surface.fill(self._cursor_color)
+            scale_factor = self._scale_factor
+            x *= scale_factor[0]
+            y *= scale_factor[1]
+            x1 *= scale_factor[0]
+
+            # Create surface and fill. The filled surface is reused while the
+            # selection fits within it, as the selection color does not change
+            buffer = self._selection_surface_buffer
+            if buffer is None or buffer.get_width() < int(x) or buffer.get_height() < int(y):
+                width, height = x, y
+                if buffer is not None:
+                    width, height = max(x, buffer.get_width()), max(y, buffer.get_height())
+                buffer = make_surface(width, height, fill_color=self._selection_color)
+                self._selection_surface_buffer = buffer
+            self._selection_surface = buffer.subsurface((0, 0, int(x), int(y)))
+            rect = self._rect
+            self._selection_position[0] = x1 + rect.x
+            self._selection_position[1] = rect.y
 
     def _get_max_container_width(self) -> int:
         """
@@ -590,17 +771,34 @@ class TextInput(Widget):
         :param color: Color of the string to render
         :return: New surface
         """
-        color = assert_color(color)
+        color = tuple(assert_color(color))
+
+        # If underline is not enabled, the surface has no underline (just text)
+        if self._input_underline_size == 0:
+            underline_string = None
+        else:
+            underline_string = self._get_underline_string(string)
+            self._current_underline_string = underline_string
+
+        # Reuse the last surface if nothing has changed
+        key = (string, color, underline_string, self._input_underline_vmargin)
+        if key == self._string_surface_cache[0]:
+            return self._string_surface_cache[1]
 
         # Create surface with no underline (just text)
         surface = self._render_string(string, color)
+        if underline_string is not None:
+            surface = self._blit_underline(surface, underline_string, color)
+        self._string_surface_cache = (key, surface)
+        return surface
 
-        # If underline is not enabled
-        if self._input_underline_size == 0:
-            return surface
-
-        current_rect = surface.get_rect()
+    def _get_underline_string(self, string: str) -> str:
+        """
+        Return the underline string drawn below the input.
 
+        :param string: String to render
+        :return: Underline string
+        """
         # Compute initial char guess
         if self._input_underline_len != 0:  # User defined the amount of underline chars to use
             char = self._input_underline_len
@@ -618,15 +816,20 @@ class TextInput(Widget):
 
             posx2 = max(self._get_max_container_width() - self._input_underline_size * 1.75 -
                         self._padding[1] - self._padding[3],
-                        current_rect.width)
+                        self._font_render_width(string))
             delta_ch = posx2 - self._title_size - self._selection_effect.get_width()
             char = math.ceil(delta_ch / self._input_underline_size)
-            for i in range(10):  # Find the best guess for
-                fw = self._font_render_string(
-                    self._input_underline * int(char), color).get_width()
-                char += 1
-                if fw >= delta_ch:
-                    break
+
+            # Check the guess, if it does not fill all the width add the missing
+            # chars at once using the width per char of the rendered guess. Then,
+            # add an extra char to fully cover the width
+            fw = self._font_render_width(self._input_underline * int(char))
+            if fw < delta_ch:
+                char_width = fw / char if fw > 0 else self._input_underline_size
+                char += math.ceil((delta_ch - fw) / char_width)
+                if self._font_render_width(self._input_underline * int(char)) < delta_ch:
+                    char += 1
+            char += 1
 
         # If char limit
         if self._maxchar != 0 or self._maxwidth_base != 0:
@@ -634,17 +837,34 @@ class TextInput(Widget):
             base_char = 'O'
             if self._password:
                 base_char = self._password_char
-            max_size = self._font_render_string(base_char * max_chars)
-            max_size = max_size.get_size()[0]
+            max_size = self._font_render_width(base_char * max_chars)
             maxchar_char = math.ceil((max_size + self._ellipsis_size) / self._input_underline_size)
             char = min(char, maxchar_char)
 
-        underline_string = self._input_underline * max(int(char), 0)
+        return self._input_underline * max(int(char), 0)
+
+    def _blit_underline(
+            self,
+            surface: 'pygame.Surface',
+            underline_string: str,
+            color: ColorType
+    ) -> 'pygame.Surface':
+        """
+        Create a new surface with the underline below the rendered string.
 
-        # Render char
-        self._current_underline_string = underline_string
-        underline = self._font_render_string(underline_string, color,
-                                             use_background_color=False)
+        :param surface: Rendered string surface
+        :param underline_string: Underline string
+        :param color: Color of the underline
+        :return: New surface
+        """
+        current_rect = surface.get_rect()
+
+        # Render char, the underline only changes if the widget is resized
+        key = (underline_string, color)
+        if key != self._underline_surface_cache[0]:
+            self._underline_surface_cache = (key, self._font_render_string(
+                underline_string, color, use_background_color=False))
+        underline = self._underline_surface_cache[1]
 
         # Create a new surface
         new_width = max(self._title_size + underline.get_size()[0], current_rect.width)
@@ -689,27 +909,19 @@ class TextInput(Widget):
 
         # Get string
         string = self._get_input_string_filtered()
+        cursor_position = self._cursor_position
 
-        # Calculate x position
+        # Calculate x position. The prefix is measured within the title, as the
+        # advance of a char in a string differs from its size alone
         if self._maxwidth == 0:  # If no limit is provided
-            cursor_x_pos = self._cursor_offset \
-                           + self._font.size(self._title + string[:self._cursor_position])[0]
+            string = string[:cursor_position]
         else:  # Calculate position depending on renderbox
-            string = string[self._renderbox[0]:(self._renderbox[0] + self._renderbox[2])]
-            cursor_x_pos = self._cursor_offset + self._font.size(self._title + string)[0]
-
-            # Add ellipsis
-            delta = self._ellipsis_size
-            if self._ellipsis_left_and_right():  # If Left+Right ellipsis
-                delta *= 1
-            elif self._ellipsis_right():  # Right ellipsis
-                delta *= 0
-            elif self._ellipsis_left():  # Left ellipsis
-                delta *= 1
-            else:
-                delta *= 0
-            cursor_x_pos += delta
-        if self._cursor_position > 0 or (self._title and self._cursor_position == 0):
+            renderbox = self._renderbox
+            string = string[renderbox[0]:renderbox[0] + renderbox[2]]
+        cursor_x_pos = self._cursor_offset + _font_size(self._font, self._title + string)[0]
+        if self._maxwidth != 0:  # Add ellipsis
+            cursor_x_pos += self._ellipsis_delta()
+        if cursor_position > 0 or (self._title and cursor_position == 0):
             # Without this, the cursor is invisible when self._cursor_position > 0:
             cursor_x_pos -= self._cursor_surface.get_width()
 
@@ -720,8 +932,9 @@ class TextInput(Widget):
         cursor_x_pos += 2
 
         # Store position, apply scale factor (experimental)
-        self._cursor_surface_pos[0] = int(cursor_x_pos) * self._scale_factor[0]
-        self._cursor_surface_pos[1] = int(cursor_y_pos) * self._scale_factor[1]
+        scale_factor = self._scale_factor
+        self._cursor_surface_pos[0] = int(cursor_x_pos) * scale_factor[0]
+        self._cursor_surface_pos[1] = int(cursor_y_pos) * scale_factor[1]
         self._cursor_render = False
 
     def _ellipsis_left(self) -> bool:
@@ -748,19 +961,30 @@ class TextInput(Widget):
         """
         return self._ellipsis_left() and self._ellipsis_right()
 
+    def _ellipsis_delta(self) -> NumberType:
+        """
+        Return the horizontal offset of the string due to the ellipsis. Only the
+        left ellipsis displaces the text.
+
+        :return: Offset in px
+        """
+        return self._ellipsis_size if self._ellipsis_left() else 0
+
     def _get_input_string_filtered(self) -> str:
         """
         Return the input string where all filters have been applied.
 
         :return: Filtered string
         """
-        string = self._input_string
+        if not self._password:
+            return self._input_string
 
-        # Apply password
-        if self._password:
-            string = self._password_char * len(string)
-
-        return string
+        # Apply password, the masked string only changes with the length
+        length = len(self._input_string)
+        if self._password_string_cache[0] != (self._password_char, length):
+            self._password_string_cache = \
+                ((self._password_char, length), self._password_char * length)
+        return self._password_string_cache[1]
 
     def _get_input_string(self, add_ellipsis: bool = True) -> str:
         """
@@ -772,12 +996,12 @@ class TextInput(Widget):
         string = self._get_input_string_filtered()
 
         if self._maxwidth != 0 and len(string) > self._maxwidth:
-            text = string[self._renderbox[0]:self._renderbox[1]]
+            start, end = self._renderbox[0], self._renderbox[1]
+            text = string[start:end]
             if add_ellipsis:
-                if self._ellipsis_right():
-                    text += self._ellipsis
-                if self._ellipsis_left():
-                    text = self._ellipsis + text
+                left = self._ellipsis if start != 0 else ''
+                right = self._ellipsis if end != len(self._input_string) else ''
+                text = f'{left}{text}{right}'
             return text
         else:
             return string
@@ -802,109 +1026,128 @@ class TextInput(Widget):
         :param update_maxwidth: Update maxwidth limit depending on the chars written
         """
         self._cursor_render = True
-        if self._maxwidth == 0:
+        maxwidth = self._maxwidth
+        if maxwidth == 0:
             return
         len_string = len(self._input_string)
-        prev_renderbox = self._renderbox.copy()
+        renderbox = self._renderbox
 
         # Move cursor to end
         if end:
-            self._renderbox[0] = max(0, len_string - self._maxwidth)
-            self._renderbox[1] = len_string
-            self._renderbox[2] = min(len_string, self._maxwidth)
+            renderbox[0] = max(0, len_string - maxwidth)
+            renderbox[1] = len_string
+            renderbox[2] = min(len_string, maxwidth)
             return
 
         # Move cursor to start
         if start:
-            self._renderbox[0] = 0
-            self._renderbox[1] = min(len_string, self._maxwidth)
-            self._renderbox[2] = 0
+            renderbox[0] = 0
+            renderbox[1] = min(len_string, maxwidth)
+            renderbox[2] = 0
             return
 
         # Check limits
         if left < 0 and len_string == 0:
             return
 
+        # The box is updated within locals, and stored at the end
+        rb0, rb1, rb2 = renderbox
+
         # If no overflow
-        if len_string <= self._maxwidth:
-            if right < 0 and self._renderbox[2] == len_string:  # If del at the end of string
+        if len_string <= maxwidth:
+            if right < 0 and rb2 == len_string:  # If del at the end of string
                 return
-            if left < 0 and self._renderbox[2] == 0:  # If cursor is at beginning
+            if left < 0 and rb2 == 0:  # If cursor is at beginning
                 return
-            self._renderbox[0] = 0  # To catch unexpected errors
+            prev_rb0 = rb0
+            rb0 = 0  # To catch unexpected errors
             if addition:  # left/right are ignored
                 if left < 0:
-                    self._renderbox[1] += left
-                self._renderbox[1] += right
+                    rb1 += left
+                rb1 += right
                 if right < 0:
-                    self._renderbox[2] -= right
+                    rb2 -= right
 
             # If text is typed increase inner position
-            if self._renderbox[0] == prev_renderbox[0]:
-                self._renderbox[2] += left
-                self._renderbox[2] += right
+            if rb0 == prev_rb0:
+                rb2 += left + right
 
         else:
             if addition:  # If text is added
                 # If press del at the end of string
-                if right < 0 and self._renderbox[2] == self._maxwidth:
+                if right < 0 and rb2 == maxwidth:
                     return
                 # If backspace at beginning of string
-                if left < 0 and self._renderbox[2] == 0:
+                if left < 0 and rb2 == 0:
                     return
 
                 # If user deletes something and it is in the end
                 if right < 0:  # del
-                    if self._ellipsis_left():
-                        if (self._renderbox[1] - 1) == len_string:  # At the end
-                            self._renderbox[2] -= right
+                    if rb0 != 0:  # Left ellipsis
+                        if (rb1 - 1) == len_string:  # At the end
+                            rb2 -= right
 
                 # If the user writes, move renderbox
                 if right > 0:
                     # If cursor is at the end push box
-                    if self._renderbox[2] == self._maxwidth:
-                        self._renderbox[0] += right
-                        self._renderbox[1] += right
-                    self._renderbox[2] += right
+                    if rb2 == maxwidth:
+                        rb0 += right
+                        rb1 += right
+                    rb2 += right
 
                 if left < 0:
                     # If cursor is at the beginning
-                    if self._renderbox[0] == 0:
-                        self._renderbox[2] += left
-                    self._renderbox[0] += left
-                    self._renderbox[1] += left
+                    if rb0 == 0:
+                        rb2 += left
+                    rb0 += left
+                    rb1 += left
 
             if not addition:  # Move inner (left/right)
-                self._renderbox[2] += right
-                self._renderbox[2] += left
+                rb2 += right + left
 
                 # If user pushes after limit the renderbox moves
-                if self._renderbox[2] < 0:
-                    self._renderbox[0] += left
-                    self._renderbox[1] += left
-                elif self._renderbox[2] > self._maxwidth:
-                    self._renderbox[0] += right
-                    self._renderbox[1] += right
+                if rb2 < 0:
+                    rb0 += left
+                    rb1 += left
+                elif rb2 > maxwidth:
+                    rb0 += right
+                    rb1 += right
                 else:
                     update_maxwidth = False
 
                 # If cursor is at limit
-                if self._renderbox[1] > len_string or self._renderbox[0] < 0:
-                    if self._renderbox[2] != self._maxwidth - 1:
+                if rb1 > len_string or rb0 < 0:
+                    if rb2 != maxwidth - 1:
                         update_maxwidth = False
 
             # Apply string limits
-            self._renderbox[1] = max(self._maxwidth, min(self._renderbox[1], len_string))
-            self._renderbox[0] = self._renderbox[1] - self._maxwidth
+            rb1 = max(maxwidth, min(rb1, len_string))
+            rb0 = rb1 - maxwidth
 
         # Apply limits
-        self._renderbox[0] = max(0, self._renderbox[0])
-        self._renderbox[1] = min(max(0, self._renderbox[1]), len_string)
-        self._renderbox[2] = max(0, min(self._renderbox[2], min(self._maxwidth, len_string)))
+        renderbox[0] = max(0, rb0)
+        renderbox[1] = min(max(0, rb1), len_string)
+        renderbox[2] = max(0, min(rb2, maxwidth, len_string))
 
         if update_maxwidth:
             self._update_maxlimit_renderbox()
 
+    def _scroll_renderbox(self) -> None:
+        """
+        Move the renderbox the least required to show the cursor. The dynamic
+        maxwidth is not fitted on each step, the caller fits it once after the move.
+        """
+        self._cursor_render = True
+        if self._maxwidth == 0:
+            return
+        len_string = len(self._input_string)
+        maxwidth = self._maxwidth
+        cursor = self._cursor_position
+        width = min(maxwidth, len_string)
+        start = max(self._renderbox[0], cursor - maxwidth, 0)
+        start = min(start, len_string - width, cursor)
+        self._renderbox[:] = start, start + width, cursor - start
+
     def _update_maxlimit_renderbox(self) -> None:
         """
         Update renderbox based on how many characters have been written on input.
@@ -912,44 +1155,52 @@ class TextInput(Widget):
         if not self._maxwidth_update:
             return
 
+        renderbox = self._renderbox
+        len_string = len(self._input_string)
+
+        # If the whole string is shown without ellipsis and fits the width, the
+        # search would stop at the first step, thus, the limit does not change
+        if 0 < len_string <= self._maxwidth and renderbox[0] == 0 and \
+                renderbox[1] == len_string and \
+                sum(self._get_chars_size(self._get_input_string_filtered())) <= self._maxwidthsize:
+            return
+
         sign = 0  # Sign of search
         while True:
             curr_string = self._get_input_string(False)  # Already filtered
             lcs = len(curr_string)
             if lcs > 0:
                 accum_size = 0
-                if self._ellipsis_left():
+                if renderbox[0] != 0 and self._maxwidth != 0:  # Left ellipsis
                     accum_size += self._ellipsis_size + 5
 
-                biggest = 0
-                for char in curr_string:
-                    char_size = self._get_char_size(char)
-                    accum_size += char_size
-                    biggest = max(biggest, char_size)
+                char_sizes = self._get_chars_size(curr_string)
+                accum_size += sum(char_sizes)
+                biggest = max(char_sizes)
 
-                if self._ellipsis_right():
+                if renderbox[1] != len_string and self._maxwidth != 0:  # Right ellipsis
                     accum_size += self._ellipsis_size
 
                 if accum_size < self._maxwidthsize - biggest:  # Increase
                     if sign < 0:
                         break
                     sign = 1
-                    if self._renderbox[0] != 0:
-                        self._renderbox[0] -= 1
+                    if renderbox[0] != 0:
+                        renderbox[0] -= 1
                     else:
                         break
                     self._maxwidth += 1
-                    self._renderbox[2] += 1
+                    renderbox[2] += 1
                 elif accum_size > self._maxwidthsize:
                     if sign > 0:
                         break
                     sign = -1
-                    if self._renderbox[2] == 0:
-                        self._renderbox[1] -= 1
+                    if renderbox[2] == 0:
+                        renderbox[1] -= 1
                     else:
-                        self._renderbox[0] += 1
-                        # self._renderbox[1] += 1
-                        self._renderbox[2] -= 1
+                        renderbox[0] += 1
+                        # renderbox[1] += 1
+                        renderbox[2] -= 1
                     self._maxwidth -= 1
                 else:
                     break
@@ -968,15 +1219,26 @@ class TextInput(Widget):
             return
         self.force_menu_surface_cache_update()
 
-        # Find the accumulated char size that gives the position of cursor
-        cursor_pos = 0
-        for i in range(len(string)):
-            curr_char = string[i] if i < len(string) - 1 else 0
-            curr_char_size = 0 if curr_char == 0 else self._font.size(curr_char)[0]
-            if self._font.size(self._title + string[0:i])[0] + curr_char_size / 2 < mouse_x:
-                cursor_pos += 1
-            else:
-                break
+        # Find the accumulated char size that gives the position of cursor. The
+        # position is the number of leading char middles on the left of the mouse.
+        # Each middle is measured from the prefix within the title, as the advance
+        # of a char in a string differs from its size alone. The prefixes are
+        # measured by the font directly, as storing them in the shared cache
+        # would evict the render sizes
+        if self._cursor_mouse_thresholds[0] != string:
+            font_size = self._font.size
+            title = self._title
+            last = len(string) - 1
+            half_size = {char: font_size(char)[0] / 2 for char in set(string)}
+            middles = [font_size(title + string[:i])[0] +
+                       (half_size[string[i]] if i < last else 0)
+                       for i in range(len(string))]  # Last char is not split by half
+
+            # A middle may be lower than the previous one (e.g. a wide char is
+            # followed by a slim one). The running maximum keeps the count of the
+            # leading middles, and it is sorted, thus, a binary search is used
+            self._cursor_mouse_thresholds = (string, list(accumulate(middles, max)))
+        cursor_pos = bisect_left(self._cursor_mouse_thresholds[1], mouse_x)
 
         # If text have ellipsis
         if self._maxwidth != 0 and len(self._input_string) > self._maxwidth:
@@ -1070,21 +1332,20 @@ class TextInput(Widget):
 
             # Filter valid chars
             if self._valid_chars is not None:
-                default_valid = ''
-                for ch in default_text:
-                    if ch in self._valid_chars:
-                        default_valid += ch
-                default_text = default_valid
+                valid_chars = self._valid_chars_set
+                default_text = ''.join([ch for ch in default_text if ch in valid_chars])
 
             # Apply maxchar
             len_text = len(default_text)
             if 0 < self._maxchar < len_text:
                 default_text = default_text[len_text - self._maxchar:len_text]
 
+            # Move the cursor and the renderbox to the end at once
             self._input_string = default_text
-            for i in range(len(default_text) + 1):
-                self._move_cursor_right()
-                self._update_renderbox(right=1, addition=True)
+            self._cursor_position = len(default_text)
+            self._update_renderbox(end=True)
+            if self._maxwidth != 0:
+                self._update_maxlimit_renderbox()
             self._update_input_string(default_text)
         else:
             raise ValueError(f'value "{text}" type is not correct according to input_type')
@@ -1108,22 +1369,24 @@ class TextInput(Widget):
         :param string: String to validate
         :return: ``True`` if the input type is valid
         """
-        if string == '':  # Empty is valid
+        input_type = self._input_type
+        if input_type == INPUT_TEXT or string == '':  # Empty is valid
             return True
-        if self._input_type == INPUT_TEXT:
-            return True
-
-        conv = None
-        if self._input_type == INPUT_FLOAT:
-            conv = float
-        elif self._input_type == INPUT_INT:
-            conv = int
-
+        conv = _INPUT_TYPE_CONV.get(input_type)
         if string == '-':
             return True
         if conv is None:
             return False
 
+        # Plain numbers (optional sign, ascii digits and a single dot if float)
+        # are valid, the conversion is only used for the other strings
+        if isinstance(string, str):
+            digits = string[1:] if string[0] == '-' else string
+            if conv is float:
+                digits = digits.replace('.', '', 1)
+            if digits != '' and _ASCII_DIGITS.issuperset(digits):
+                return True
+
         try:
             conv(string)
             return True
@@ -1147,19 +1410,46 @@ class TextInput(Widget):
                                     len(self._input_string))
         self._update_renderbox(right=1)
 
+    @property
+    def _cursor_visible(self) -> bool:
+        """
+        Return ``True`` if the cursor is in the visible phase of the blink. The
+        phase is derived from the time elapsed since the cursor was last set
+        visible, thus, it does not require to be updated each frame.
+
+        :return: Boolean
+        """
+        elapsed = pygame.time.get_ticks() - self._cursor_visible_ticks
+        return (elapsed // self._cursor_switch_ms) % 2 == 0
+
+    @_cursor_visible.setter
+    def _cursor_visible(self, value: bool) -> None:
+        """
+        Restart the cursor blink, visible or not.
+
+        :param value: If ``True`` the cursor starts visible
+        """
+        self._cursor_visible_ticks = pygame.time.get_ticks()
+        if not value:
+            self._cursor_visible_ticks -= self._cursor_switch_ms
+
     def _blur(self) -> None:
         # self._key_is_pressed = False
         self._mouse_is_pressed = False
         self._keyrepeat_mouse_ms = 0
-        self._cursor_ms_counter = 0
         self._cursor_visible = False
         self._unselect_text()
         # self._history_index = len(self._history) - 1
 
     def _focus(self) -> None:
-        self._cursor_ms_counter = 0
         self._cursor_visible = True
         self._cursor_render = True
+        self._update_keydown_table()
+
+    def set_controller(self, controller: 'ctrl.Controller') -> 'TextInput':
+        super(TextInput, self).set_controller(controller)
+        self._update_keydown_table()
+        return self
 
     def _unselect_text(self) -> bool:
         """
@@ -1173,8 +1463,6 @@ class TextInput(Widget):
         self._selection_box[0] = 0
         self._selection_box[1] = 0
         self._selection_surface = None
-        if self._cursor_surface is not None:
-            self._cursor_surface.fill(self._cursor_color)
         self._selection_active = False
         self.force_menu_surface_cache_update()
         return True
@@ -1213,9 +1501,7 @@ class TextInput(Widget):
             # Add new status to history
             self._history.insert(self._history_index, new_string)
             self._history_cursor.insert(self._history_index, self._cursor_position)
-            self._history_renderbox.insert(self._history_index,
-                                           [self._renderbox[0], self._renderbox[1],
-                                            self._renderbox[2]])
+            self._history_renderbox.insert(self._history_index, tuple(self._renderbox))
 
             if len(self._history) > self._max_history:
                 self._history.pop(0)
@@ -1272,10 +1558,24 @@ class TextInput(Widget):
         :param char: Char
         :return: Char size in px
         """
-        if char in self._keychar_size.keys():
-            return self._keychar_size[char]
-        self._keychar_size[char] = self._font_render_string(char).get_size()[0]
-        return self._keychar_size[char]
+        size = self._keychar_size.get(char)
+        if size is None:
+            # The measurement is shared by all widgets using the same font
+            size = self._font_render_width(char)
+            self._keychar_size[char] = size
+        return size
+
+    def _get_chars_size(self, string: str) -> List[NumberType]:
+        """
+        Return the size of each char of the string in pixels. Only the sizes not
+        stored yet are computed, the others are read without a Python loop.
+
+        :param string: String
+        :return: Char sizes in px
+        """
+        for char in set(string).difference(self._keychar_size):
+            self._get_char_size(char)
+        return list(map(self._keychar_size.__getitem__, string))
 
     def _paste(self) -> bool:
         """
@@ -1296,23 +1596,15 @@ class TextInput(Widget):
         except PyperclipException:
             return False
 
-        text = text.strip()
-        for i in ['\n', '\r']:
-            text = text.replace(i, '')
-
-        # Delete escape chars
-        escapes = ''.join([chr(char) for char in range(1, 32)])
-        text = text.translate(escapes)
+        # Delete escape chars, including new lines
+        text = text.strip().translate(_ESCAPE_TABLE)
         if text == '':
             return False
 
-        # Remove invalid chars
+        # Remove invalid chars, the deletion table only contains the distinct
+        # invalid chars of the pasted text
         if self._valid_chars is not None:
-            valid_text = ''
-            for ch in text:
-                if ch in self._valid_chars:
-                    valid_text += ch
-            text = valid_text
+            text = text.translate(dict.fromkeys(map(ord, set(text) - self._valid_chars_set)))
             if text == '':
                 return False
 
@@ -1339,11 +1631,11 @@ class TextInput(Widget):
 
             self._sound.play_key_add()
             self._input_string = new_string  # For a purpose of computing render_box
-            for i in range(len(text)):  # Move cursor
-                self._move_cursor_right()
+            self._cursor_position = min(self._cursor_position + len(text), len(new_string))
+            self._scroll_renderbox()
+            self._update_maxlimit_renderbox()  # History stores the fitted renderbox
             self._update_input_string(new_string)
             self.change()
-            self._update_maxlimit_renderbox()
             self._block_copy_paste = True
 
         else:
@@ -1357,9 +1649,7 @@ class TextInput(Widget):
         Update all from history.
         """
         self._input_string = self._history[self._history_index]
-        self._renderbox[0] = self._history_renderbox[self._history_index][0]
-        self._renderbox[1] = self._history_renderbox[self._history_index][1]
-        self._renderbox[2] = self._history_renderbox[self._history_index][2]
+        self._renderbox[:] = self._history_renderbox[self._history_index]
         self._cursor_position = self._history_cursor[self._history_index]
         self._cursor_render = True
 
@@ -1394,34 +1684,57 @@ class TextInput(Widget):
         Remove text from selection.
         """
         removed = self._selection_box[1] - self._selection_box[0]
-        left = False
-        if self._selection_box[0] == self._cursor_position:
-            left = True
-
-        for i in range(removed):
-            if left:
-                self._delete(update_history=i == removed - 1)
+        if removed > 0:
+            # Remove the selected chars at the side of the cursor
+            cursor = self._cursor_position
+            if self._selection_box[0] == cursor:
+                self._remove_chars(cursor, cursor + removed)
             else:
-                self._backspace(update_history=i == removed - 1)
+                self._remove_chars(max(cursor - removed, 0), cursor)
 
         # Destroy selection
         self._unselect_text()
 
+    def _remove_chars(self, start: int, end: int) -> None:
+        """
+        Remove the chars between the given positions at once, and move the cursor
+        to the start. The history is updated only once.
+
+        :param start: Start position
+        :param end: End position
+        """
+        new_string = self._input_string[:start] + self._input_string[end:]
+        if self._maxwidth != 0:
+            # As if the chars were removed one at a time, the renderbox keeps its
+            # end if these are on the right of the cursor (delete), else, the end
+            # moves along with the chars after them (backspace)
+            renderbox = self._renderbox
+            box_end = renderbox[1]
+            if self._cursor_position == end:
+                box_end -= end - start
+            width = min(self._maxwidth, len(new_string))
+            renderbox[0] = max(width, min(box_end, len(new_string))) - width
+        self._input_string = new_string  # For a purpose of computing render_box
+        self._cursor_position = start
+        self._scroll_renderbox()
+        if self._maxwidth != 0:
+            self._update_maxlimit_renderbox()
+        self._update_input_string(new_string)  # History stores the fitted renderbox
+
     def _backspace(self, update_history=True) -> None:
         """
         Backspace event.
 
         :param update_history: Updates history on deletion
         """
-        new_string = (
-                self._input_string[:max(self._cursor_position - 1, 0)]
-                + self._input_string[self._cursor_position:]
-        )
+        cursor = self._cursor_position
+        string = self._input_string
+        new_string = string[:max(cursor - 1, 0)] + string[cursor:]
         self._update_input_string(new_string, update_history=update_history)
         self._update_renderbox(left=-1, addition=True)
 
         # Subtract one from cursor_pos, but do not go below zero:
-        self._cursor_position = max(self._cursor_position - 1, 0)
+        self._cursor_position = max(cursor - 1, 0)
 
     def _delete(self, update_history: bool = True) -> None:
         """
@@ -1429,10 +1742,9 @@ class TextInput(Widget):
 
         :param update_history: Updates history on deletion
         """
-        new_string = (
-                self._input_string[:self._cursor_position]
-                + self._input_string[self._cursor_position + 1:]
-        )
+        cursor = self._cursor_position
+        string = self._input_string
+        new_string = string[:cursor] + string[cursor + 1:]
         self._update_input_string(new_string, update_history=update_history)
         self._update_renderbox(right=-1, addition=True)
 
@@ -1452,9 +1764,10 @@ class TextInput(Widget):
 
     def _push_key_input(self, keychar: str, sounds: bool = True) -> bool:
         """
-        Insert a key in the cursor position.
+        Insert a key in the cursor position. Several chars can be inserted at
+        once, these are cut to the available size, if limited.
 
-        :param keychar: Char to be inserted
+        :param keychar: Char(s) to be inserted
         :param sounds: Use widget sounds
         :return: If ``False`` the event loop breaks
         """
@@ -1468,41 +1781,56 @@ class TextInput(Widget):
                 self._sound.play_event_error()
             return False
 
-        # If no special key is pressed, add unicode of key to input_string
-        new_string = (
-                self._input_string[:self._cursor_position]
-                + keychar
-                + self._input_string[self._cursor_position:]
-        )
-
         # If unwanted escape sequences
-        event_escaped = repr(keychar)
-        if '\\r' in event_escaped:
+        if '\r' in keychar:
             return False
 
         # Check if char is valid
-        if self._valid_chars is not None and keychar not in self._valid_chars:
+        l_key = len(keychar)
+        if self._valid_chars is not None and (
+                not self._valid_chars_set.issuperset(keychar) if l_key > 1
+                else keychar not in self._valid_chars_set):
             if sounds:
                 self._sound.play_event_error()
             return False
 
+        # Cut the chars to the available size
+        if self._maxchar != 0 and l_key > 1:
+            keychar = keychar[:self._maxchar - len(self._input_string)]
+            l_key = len(keychar)
+
+        # If no special key is pressed, add unicode of key to input_string. The
+        # string is only built for the chars that passed the checks above. Most
+        # of the time the cursor is at the end, thus, the chars are appended
+        string = self._input_string
+        cursor = self._cursor_position
+        if cursor == len(string):
+            new_string = string + keychar
+        else:
+            new_string = string[:cursor] + keychar + string[cursor:]
+
         # If data is valid
         if self._check_input_type(new_string):
-            l_key = len(keychar)
-            if l_key > 0:
+            if l_key > 0:  # Some are empty, e.g. K_UP
 
                 # Update char size
-                if keychar not in self._keychar_size.keys():
-                    self._get_char_size(keychar)  # This updates keychar size data
-                self._last_char = keychar
+                for char in set(keychar):
+                    if char not in self._keychar_size:
+                        self._get_char_size(char)  # This updates keychar size data
+                self._last_char = keychar[-1]
 
                 # Update string
                 if sounds:
                     self._sound.play_key_add()
-                self._cursor_position += 1  # Some are empty, e.g. K_UP
+                self._cursor_position += l_key
                 self._input_string = new_string  # Only here this is changed (due to renderbox update)
                 self._update_input_string(new_string)  # Update the string and the history
-                self._update_renderbox(right=1, addition=True)
+                if l_key == 1:
+                    self._update_renderbox(right=1, addition=True)
+                else:
+                    self._scroll_renderbox()
+                    if self._maxwidth != 0:
+                        self._update_maxlimit_renderbox()
                 self.change()
                 return True
         else:
@@ -1510,379 +1838,507 @@ class TextInput(Widget):
                 self._sound.play_event_error()
         return False
 
-    def update(self, events: EventVectorType) -> bool:
-        if self._apply_widget_update_callback:
-            self.apply_update_callbacks(events)
+    def _update_keydown_table(self) -> None:
+        """
+        Update the table of the actions by key. The events of the default
+        controller only compare the key, thus, if these are not overridden (within
+        the instance or the class), each key press is looked up in the table
+        instead of testing each event. Otherwise, there's no table.
 
-        self._clock.tick(60)
+        The table is updated when the controller is set and when the widget
+        receives the focus, thus, the changes of the key constants of
+        ``pygame_menu.controls`` or of the controller events apply from then.
+        """
+        controller = self._ctrl
+        controller_class = type(controller)
+        if not _CTRL_KEYDOWN_EVENTS.isdisjoint(getattr(controller, '__dict__', ())) or \
+                any(getattr(controller_class, name, None) is not default
+                    for name, default in _CTRL_KEYDOWN_DEFAULTS):
+            self._keydown_table = None
+            return
+        keys = (ctrl.KEY_BACK, pygame.K_DELETE, ctrl.KEY_RIGHT, ctrl.KEY_LEFT,
+                ctrl.KEY_MOVE_UP, ctrl.KEY_MOVE_DOWN, pygame.K_END, pygame.K_HOME,
+                ctrl.KEY_TAB, ctrl.KEY_APPLY, pygame.K_ESCAPE)
+        # If keys are repeated the first event takes precedence
+        actions = [action for _, action in self._keydown_actions]
+        self._keydown_table = dict(zip(reversed(keys), reversed(actions)))
 
-        # Check mouse pressed
-        # noinspection PyArgumentList
-        mouse_left, mouse_middle, mouse_right = pygame.mouse.get_pressed()
-        self._mouse_is_pressed = (mouse_left or mouse_right or mouse_middle) and \
-                                 self._mouse_enabled
+    def _get_keydown_action(self, event: EventType) -> Optional[Callable[[], Tuple2BoolType]]:
+        """
+        Return the action of the first controller event matched by the key press.
 
-        rect = self.get_rect(to_real_position=True)
+        :param event: Key down event
+        :return: Action, ``None`` if no controller event matched
+        """
+        if self._keydown_table is not None:
+            return self._keydown_table.get(event.key)
+        for name, action in self._keydown_actions:
+            if getattr(self._ctrl, name)(event, self):
+                return action
+        return None
 
-        if self.readonly or not self.is_visible():
-            self._readonly_check_mouseover(events, rect)
-            return False
+    def _keydown_back(self) -> Tuple2BoolType:
+        """
+        Backspace button, delete text from right.
 
-        # Get time clock
-        time_clock = self._clock.get_time()
+        :return: Tuple of (updated, stop the event loop)
+        """
+        # Play sound
+        if self._cursor_position == 0:
+            self._sound.play_event_error()
+        else:
+            self._sound.play_key_del()
 
-        # Update cursor switch
-        self._cursor_ms_counter += time_clock
-        if self._cursor_ms_counter >= self._cursor_switch_ms:
-            self._cursor_ms_counter %= self._cursor_switch_ms
-            self._cursor_visible = not self._cursor_visible
-            self.force_menu_surface_cache_update()
+        # If text is selected
+        if self._selection_surface:
+            self._remove_selection()
+            return True, True
 
-        updated = False
-        events = self._merge_events(events)  # Extend events with custom events
+        self._backspace()
+        self.change()
+        self.active = True
+        return True, False
 
-        for event in events:
+    def _keydown_delete(self) -> Tuple2BoolType:
+        """
+        Delete button, delete text from left.
 
-            # Check mouse over
-            self._check_mouseover(event, rect)
+        :return: Tuple of (updated, stop the event loop)
+        """
+        # Play sound
+        if self._cursor_position == len(self._input_string):
+            self._sound.play_event_error()
+        else:
+            self._sound.play_key_del()
 
-            # User press a key
-            if event.type == pygame.KEYDOWN and self._keyboard_enabled:
-                # Check if any key is pressed, if True the event is invalid
-                if self._ignores_keyboard_nonphysical() and not check_key_pressed_valid(event):
-                    continue
-
-                self._cursor_visible = True  # So the user sees where he writes
-                self._key_is_pressed = True
-                self._last_key = event.key
-
-                # If None exist, create counter for that key:
-                if event.key not in self._keyrepeat_counters and \
-                        event.key not in self._ignore_keys and \
-                        'unicode' in event.dict:
-                    self._keyrepeat_counters[event.key] = [0, event.unicode]
-
-                # User press ctrl+something
-                if pygame.key.get_mods() in CTRL_KMOD:
-                    # If test, disable CTRL
-                    if 'test' in event.dict and event.dict['test']:
-                        # noinspection PyArgumentList
-                        pygame.key.set_mods(pygame.KMOD_NONE)
-
-                    # Ctrl+C copy
-                    if event.key == pygame.K_c:
-                        if not self._copy_paste_enabled:
-                            self._sound.play_event_error()
-                            break
-                        self.active = True
-                        copy_status = self._copy()
-                        if not copy_status:
-                            self._sound.play_event_error()
-                        updated = updated or copy_status
-                        break
+        # If text is selected
+        if self._selection_surface:
+            self._remove_selection()
+            return True, True
 
-                    # Ctrl+V paste
-                    elif event.key == pygame.K_v:
-                        if not self._copy_paste_enabled:
-                            self._sound.play_event_error()
-                            break
-                        self.active = True
-                        updated = updated or self._paste()
-                        break
+        self._delete()
+        self.change()
+        self.active = True
+        return True, False
 
-                    # Ctrl+Z undo
-                    elif event.key == pygame.K_z:
-                        if self._max_history == 0:
-                            self._sound.play_event_error()
-                            break
-                        self.active = True
-                        self._sound.play_key_del()
-                        updated = updated or self._undo()
-                        break
+    def _keydown_right(self) -> Tuple2BoolType:
+        """
+        Right arrow.
 
-                    # Ctrl+Y redo
-                    elif event.key == pygame.K_y:
-                        if self._max_history == 0:
-                            self._sound.play_event_error()
-                            break
-                        self.active = True
-                        self._sound.play_key_add()
-                        updated = updated or self._redo()
-                        break
+        :return: Tuple of (updated, stop the event loop)
+        """
+        cursor = self._cursor_position
+        len_string = len(self._input_string)
 
-                    # Ctrl+X cut
-                    elif event.key == pygame.K_x:
-                        if not self._copy_paste_enabled:
-                            self._sound.play_event_error()
-                            break
-                        self.active = True
-                        self._sound.play_key_del()
-                        updated = updated or self._cut()
-                        break
+        # Play sound
+        if cursor == len_string:
+            self._sound.play_event_error()
+        else:
+            self._sound.play_key_add()
 
-                    # Ctrl+A select all
-                    elif event.key == pygame.K_a:
-                        if not self._selection_enabled:
-                            self._sound.play_event_error()
-                            break
-                        self.active = True
-                        self._select_all()
-                        updated = True
-                        break
+        # Update selection box
+        if self._selection_active:
+            sel = self._selection_box
+            if cursor != sel[1]:  # Shrink the box
+                sel[0] = min(sel[1], sel[0] + 1)
+            elif sel[0] == sel[1]:  # Start the box
+                sel[1] += 1
+            else:  # Extend the box
+                sel[1] = min(len_string, sel[1] + 1)
+        else:
+            if self._unselect_text():
+                return False, True
 
-                    # Command not found, returns
-                    else:
-                        break
+        # Move cursor
+        self._move_cursor_right()
+        self.active = True
+        return True, False
 
-                # User press alt+x get the unicode char from string
-                if pygame.key.get_mods() in (pygame.KMOD_ALT, pygame.KMOD_LALT) and \
-                        event.key == pygame.K_x and self._alt_x_enabled:
-                    # Get the last hex value
-                    last_space = self._input_string.rfind(' ')
-                    if last_space == -1:  # space not found, try 0x
-                        last_space = self._input_string.rfind('0x')
-                    if last_space == -1:  # 0x not found, try 0X
-                        last_space = self._input_string.rfind('0x')
-                    if last_space == -1:  # Finally, find the subsequence of valid hex chars
-                        last_space = 0
-                        for j in range(len(self._input_string)):
-                            if self._input_string[j].lower() not in \
-                                    ('0', '1', '2', '3', '4', '5', '6', '7',
-                                     '8', '9', 'a', 'b', 'c', 'd', 'e', 'f'):
-                                last_space = j + 1
-                        if last_space >= len(self._input_string):
-                            last_space = -1
-                    if last_space >= 0:
-                        try:
-                            unicode_hex = self._input_string[last_space:]
-                            if unicode_hex.lower() == '0x':
-                                continue
-                            unicode_int = int(unicode_hex, 16)
-
-                            # Remove the code
-                            for _ in range(len(unicode_hex)):
-                                self._backspace()
-
-                            if not self._push_key_input(chr(unicode_int)):
-                                break
-                            self.active = True
-                            updated = True
-                            continue
-                        except (ValueError, OverflowError):
-                            pass
-
-                # Backspace button, delete text from right
-                if self._ctrl.back(event, self):
-                    # Play sound
-                    if self._cursor_position == 0:
-                        self._sound.play_event_error()
-                    else:
-                        self._sound.play_key_del()
+    def _keydown_left(self) -> Tuple2BoolType:
+        """
+        Left arrow.
 
-                    # If text is selected
-                    if self._selection_surface:
-                        self._remove_selection()
-                        updated = True
-                        break
+        :return: Tuple of (updated, stop the event loop)
+        """
+        cursor = self._cursor_position
 
-                    self._backspace()
-                    self.change()
-                    self.active = True
-                    updated = True
+        # Play sound
+        if cursor == 0:
+            self._sound.play_event_error()
+        else:
+            self._sound.play_key_add()
 
-                # Delete button, delete text from left
-                elif self._ctrl.delete(event, self):
-                    # Play sound
-                    if self._cursor_position == len(self._input_string):
-                        self._sound.play_event_error()
-                    else:
-                        self._sound.play_key_del()
+        # Update selection box
+        if self._selection_active:
+            sel = self._selection_box
+            if cursor == sel[0]:  # Extend the box
+                sel[0] = max(0, sel[0] - 1)
+            else:  # Shrink the box
+                sel[1] = max(sel[0], sel[1] - 1)
+        else:
+            if self._unselect_text():
+                return False, True
 
-                    updated = True
+        # Move cursor
+        self._move_cursor_left()
+        self.active = True
+        return True, False
 
-                    # If text is selected
-                    if self._selection_surface:
-                        self._remove_selection()
-                        break
+    def _keydown_move(self) -> Tuple2BoolType:
+        """
+        Up/Down arrow.
 
-                    self._delete()
-                    self.change()
-                    self.active = True
+        :return: Tuple of (updated, stop the event loop)
+        """
+        self.active = False
+        return False, False
 
-                # Right arrow
-                elif self._ctrl.right(event, self):
-                    # Play sound
-                    if self._cursor_position == len(self._input_string):
-                        self._sound.play_event_error()
-                    else:
-                        self._sound.play_key_add()
-
-                    # Update selection box
-                    if self._selection_active:
-                        if self._cursor_position == self._selection_box[1]:
-                            if self._selection_box[0] == self._selection_box[1]:
-                                self._selection_box[1] = self._selection_box[0] + 1
-                            else:
-                                self._selection_box[1] = min(len(self._input_string),
-                                                             self._selection_box[1] + 1)
-                        else:
-                            self._selection_box[0] = min(self._selection_box[1],
-                                                         self._selection_box[0] + 1)
-                    else:
-                        if self._unselect_text():
-                            break
+    def _jump_cursor(self, to_start: bool) -> Tuple2BoolType:
+        """
+        Home/End, move the cursor to the start or the end of the string.
 
-                    # Move cursor
-                    self._move_cursor_right()
-                    self.active = True
-                    updated = True
+        :param to_start: If ``True`` move to the start, else, to the end
+        :return: Tuple of (updated, stop the event loop)
+        """
+        self._sound.play_key_add()
+        self._cursor_position = 0 if to_start else len(self._input_string)
+        self._update_renderbox(start=to_start, end=not to_start)
+        self._unselect_text()
+        self.active = True
+        return True, False
 
-                # Left arrow
-                elif self._ctrl.left(event, self):
-                    # Play sound
-                    if self._cursor_position == 0:
-                        self._sound.play_event_error()
-                    else:
-                        self._sound.play_key_add()
-
-                    # Update selection box
-                    if self._selection_active:
-                        if self._cursor_position == self._selection_box[0]:
-                            self._selection_box[0] = max(0, self._selection_box[0] - 1)
-                        else:
-                            if self._selection_box[1] - self._selection_box[0] == 1:
-                                self._selection_box[1] = self._selection_box[0]
-                            else:
-                                self._selection_box[1] = max(self._selection_box[0],
-                                                             self._selection_box[1] - 1)
-                    else:
-                        if self._unselect_text():
-                            break
+    def _keydown_tab(self) -> Tuple2BoolType:
+        """
+        Tab, insert spaces.
 
-                    # Move cursor
-                    self._move_cursor_left()
+        :return: Tuple of (updated, stop the event loop)
+        """
+        if self._tab_size > 0:
+            self._push_key_input(' ' * self._tab_size)
+        self.active = True
+        return self._tab_size > 0, False
+
+    def _keydown_apply(self) -> Tuple2BoolType:
+        """
+        Enter, apply the widget.
+
+        :return: Tuple of (updated, stop the event loop)
+        """
+        self._sound.play_open_menu()
+        self.apply()
+        self._unselect_text()
+        self.active = not self.active
+        return True, False
+
+    def _keydown_escape(self) -> Tuple2BoolType:
+        """
+        Escape, unselect the text or disable the active status.
+
+        :return: Tuple of (updated, stop the event loop)
+        """
+        # Same as testing _get_selected_text(), without slicing the string
+        start, end = self._selection_box
+        if min(end, len(self._input_string)) > start:
+            self._unselect_text()
+            return True, False
+        elif self.active:
+            # Disable active status on the widget
+            self.active = False
+            return True, False
+        return False, False
+
+    # noinspection PyUnusedLocal
+    def _handle_keydown(self, event: EventType, rect: 'pygame.Rect', mods: int) -> Tuple2BoolType:
+        """
+        Handle a key press.
+
+        :param event: Key down event
+        :param rect: Widget rect
+        :param mods: Key modifiers state
+        :return: Tuple of (updated, stop the event loop)
+        """
+        if not self._keyboard_enabled:
+            return False, False
+
+        # Check if any key is pressed, if True the event is invalid
+        if self._ignores_keyboard_nonphysical() and not check_key_pressed_valid(event):
+            return False, False
+
+        key = event.key
+        self._cursor_visible = True  # So the user sees where he writes
+        self._key_is_pressed = True
+        self._last_key = key
+
+        # If None exist, create counter for that key:
+        if key not in self._keyrepeat_counters and \
+                key not in self._ignore_keys and \
+                'unicode' in event.dict:
+            self._keyrepeat_counters[key] = 0
+            self._keyrepeat_unicode[key] = event.unicode
+
+        # User press ctrl+something
+        if mods in CTRL_KMOD:
+            # If test, disable CTRL
+            if event.dict.get('test'):
+                # noinspection PyArgumentList
+                pygame.key.set_mods(pygame.KMOD_NONE)
+
+            # Ctrl+C copy
+            if key == pygame.K_c:
+                if not self._copy_paste_enabled:
+                    self._sound.play_event_error()
+                    return False, True
+                self.active = True
+                copy_status = self._copy()
+                if not copy_status:
+                    self._sound.play_event_error()
+                return copy_status, True
+
+            # Ctrl+V paste
+            elif key == pygame.K_v:
+                if not self._copy_paste_enabled:
+                    self._sound.play_event_error()
+                    return False, True
+                self.active = True
+                return self._paste(), True
+
+            # Ctrl+Z undo
+            elif key == pygame.K_z:
+                if self._max_history == 0:
+                    self._sound.play_event_error()
+                    return False, True
+                self.active = True
+                self._sound.play_key_del()
+                return self._undo(), True
+
+            # Ctrl+Y redo
+            elif key == pygame.K_y:
+                if self._max_history == 0:
+                    self._sound.play_event_error()
+                    return False, True
+                self.active = True
+                self._sound.play_key_add()
+                return self._redo(), True
+
+            # Ctrl+X cut
+            elif key == pygame.K_x:
+                if not self._copy_paste_enabled:
+                    self._sound.play_event_error()
+                    return False, True
+                self.active = True
+                self._sound.play_key_del()
+                return self._cut(), True
+
+            # Ctrl+A select all
+            elif key == pygame.K_a:
+                if not self._selection_enabled:
+                    self._sound.play_event_error()
+                    return False, True
+                self.active = True
+                self._select_all()
+                return True, True
+
+            # Command not found, returns
+            else:
+                return False, True
+
+        # User press alt+x get the unicode char from string
+        if mods in (pygame.KMOD_ALT, pygame.KMOD_LALT) and \
+                key == pygame.K_x and self._alt_x_enabled:
+            # Get the last hex value
+            last_space = self._input_string.rfind(' ')
+            if last_space == -1:  # space not found, try 0x
+                last_space = self._input_string.rfind('0x')
+            if last_space == -1:  # 0x not found, try 0X
+                last_space = self._input_string.rfind('0x')
+            if last_space == -1:  # Finally, find the subsequence of valid hex chars
+                last_space = 0
+                for j in range(len(self._input_string)):
+                    if self._input_string[j].lower() not in \
+                            ('0', '1', '2', '3', '4', '5', '6', '7',
+                             '8', '9', 'a', 'b', 'c', 'd', 'e', 'f'):
+                        last_space = j + 1
+                if last_space >= len(self._input_string):
+                    last_space = -1
+            if last_space >= 0:
+                try:
+                    unicode_hex = self._input_string[last_space:]
+                    if unicode_hex.lower() == '0x':
+                        return False, False
+                    unicode_int = int(unicode_hex, 16)
+
+                    # Remove the code
+                    cursor = self._cursor_position
+                    self._remove_chars(max(cursor - len(unicode_hex), 0), cursor)
+
+                    if not self._push_key_input(chr(unicode_int)):
+                        return False, True
                     self.active = True
-                    updated = True
+                    return True, False
+                except (ValueError, OverflowError):
+                    pass
+
+        # Controller events
+        action = self._get_keydown_action(event)
+        if action is not None:
+            return action()
+
+        # Press lshift, rshift -> selection
+        if key in _SHIFT_KEYS:
+            if not self._selection_active:
+                self._selection_active = True
+                self._selection_box[0] = self._cursor_position
+                self._selection_box[1] = self._cursor_position
+            self.active = True
+            return False, True
+
+        # Any other key, add as input
+        if key not in self._ignore_keys and hasattr(event, 'unicode'):
+            unicode = event.unicode
+            if unicode == ' ' and key != 32:
+                # The event is always discarded, but the warning (which inspects
+                # the stack) is stripped if python runs with -O
+                if __debug__:
+                    warn(
+                        f'{self.get_class_id()} received "{unicode}" '
+                        f'unicode but key is different than 32 ({key}), '
+                        f'check if event has defined the proper unicode char'
+                    )
+                return False, True
+
+            # Error in char, not valid or string limit exceeds
+            if not self._push_key_input(unicode):
+                return False, True
+            self.active = True
+            return True, False
+
+        return False, False
+
+    # noinspection PyUnusedLocal
+    def _handle_keyup(self, event: EventType, rect: 'pygame.Rect', mods: int) -> Tuple2BoolType:
+        """
+        Handle a key release.
+
+        :param event: Key up event
+        :param rect: Widget rect
+        :param mods: Key modifiers state
+        :return: Tuple of (updated, stop the event loop)
+        """
+        if not self._keyboard_enabled:
+            return False, False
+
+        # Because KEYUP doesn't include event.unicode, this dict is stored
+        # in such a weird way
+        key = event.key
+        if key in self._keyrepeat_counters:
+            del self._keyrepeat_counters[key]
+            del self._keyrepeat_unicode[key]
+
+        # If selection keys are released, stop selection
+        elif key in _SHIFT_KEYS:
+            self._selection_active = False
+
+        # Release inputs
+        self._block_copy_paste = False
+        self._key_is_pressed = False
+        return False, False
+
+    # noinspection PyUnusedLocal
+    def _handle_mouse(self, event: EventType, rect: 'pygame.Rect', mods: int) -> Tuple2BoolType:
+        """
+        Handle a mouse button or finger press/release.
+
+        :param event: Mouse or finger event
+        :param rect: Widget rect
+        :param mods: Key modifiers state
+        :return: Tuple of (updated, stop the event loop)
+        """
+        event_type = event.type
+
+        # User releases the mouse button or finger; don't consider the mouse
+        # wheel (button 4 & 5)
+        if event_type == pygame.MOUSEBUTTONUP and self._mouse_enabled and \
+                event.button in (1, 2, 3) or \
+                event_type == FINGERUP and self._touchscreen_enabled and self._menu is not None:
+            event_pos = get_finger_pos(self._menu, event)
+            if rect.collidepoint(*event_pos) and \
+                    self.get_selected_time() > 1.5 * self._keyrepeat_mouse_interval_ms:
+                self._selection_active = False
+                self._check_mouse_collide_input(event_pos)
+                self._cursor_visible = True
+
+        # User press the mouse button or finger; don't consider the mouse
+        # wheel (button 4 & 5)
+        elif event_type == pygame.MOUSEBUTTONDOWN and self._mouse_enabled and \
+                event.button in (1, 2, 3) or \
+                event_type == FINGERDOWN and self._touchscreen_enabled:
+            if self.get_selected_time() > self._keyrepeat_mouse_interval_ms or \
+                    hasattr(event, 'test'):
+                if self._selection_active:
+                    self._unselect_text()
+                self._cursor_visible = True
+                self._selection_active = True
+                if event_type == pygame.MOUSEBUTTONDOWN:
+                    self._selection_mouse_first_position = -1
+                self.active = True
+        return False, False
 
-                # Up arrow
-                elif self._ctrl.move_up(event, self):
-                    self.active = False
+    def update(self, events: EventVectorType) -> bool:
+        if self._apply_widget_update_callback:
+            self.apply_update_callbacks(events)
 
-                # Down arrow
-                elif self._ctrl.move_down(event, self):
-                    self.active = False
+        # Get time clock. This is updated even if the widget is readonly or hidden,
+        # thus, the time of these frames is not added to the key repeat counters
+        ticks = pygame.time.get_ticks()
+        time_clock = ticks - self._last_update_ticks
+        self._last_update_ticks = ticks
 
-                # End
-                elif self._ctrl.end(event, self):
-                    self._sound.play_key_add()
-                    self._cursor_position = len(self._input_string)
-                    self._update_renderbox(end=True)
-                    self._unselect_text()
-                    self.active = True
-                    updated = True
+        # Check mouse pressed
+        # noinspection PyArgumentList
+        mouse_left, mouse_middle, mouse_right = pygame.mouse.get_pressed()
+        self._mouse_is_pressed = (mouse_left or mouse_right or mouse_middle) and \
+                                 self._mouse_enabled
 
-                # Home
-                elif self._ctrl.home(event, self):
-                    self._sound.play_key_add()
-                    self._cursor_position = 0
-                    self._update_renderbox(start=True)
-                    self._unselect_text()
-                    self.active = True
-                    updated = True
+        rect = self.get_rect(to_real_position=True)
 
-                # Tab
-                elif self._ctrl.tab(event, self):
-                    for _ in range(self._tab_size):
-                        self._push_key_input(' ')
-                        updated = True
-                    self.active = True
+        if self.readonly or not self.is_visible():
+            self._readonly_check_mouseover(events, rect)
+            return False
 
-                # Enter
-                elif self._ctrl.apply(event, self):
-                    self._sound.play_open_menu()
-                    self.apply()
-                    self._unselect_text()
-                    updated = True
-                    self.active = not self.active
-
-                # Escape
-                elif self._ctrl.escape(event, self):
-                    if self._get_selected_text():
-                        self._unselect_text()
-                        updated = True
-                    elif self.active:
-                        # Disable active status on the widget
-                        self.active = False
-                        updated = True
-
-                # Press lshift, rshift -> selection
-                elif event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-                    if not self._selection_active:
-                        self._selection_active = True
-                        self._selection_box[0] = self._cursor_position
-                        self._selection_box[1] = self._cursor_position
-                    self.active = True
-                    break
+        # Update cursor switch, the cursor is only drawn if selected
+        if self._selected:
+            cursor_visible = self._cursor_visible
+            if cursor_visible != self._cursor_visible_last:
+                self._cursor_visible_last = cursor_visible
+                self.force_menu_surface_cache_update()
 
-                # Any other key, add as input
-                elif event.key not in self._ignore_keys and hasattr(event, 'unicode'):
-                    if event.unicode == ' ' and event.key != 32:
-                        warn(
-                            f'{self.get_class_id()} received "{event.unicode}" '
-                            f'unicode but key is different than 32 ({event.key}), '
-                            f'check if event has defined the proper unicode char'
-                        )
-                        break
+        events = self._merge_events(events)  # Extend events with custom events
 
-                    # Error in char, not valid or string limit exceeds
-                    if not self._push_key_input(event.unicode):
-                        break
-                    self.active = True
-                    updated = True
-
-            # User releases a key
-            elif event.type == pygame.KEYUP and self._keyboard_enabled:
-                # Because KEYUP doesn't include event.unicode, this dict is stored
-                # in such a weird way
-                if event.key in self._keyrepeat_counters:
-                    del self._keyrepeat_counters[event.key]
-
-                # If selection keys are released, stop selection
-                elif event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-                    self._selection_active = False
-
-                # Release inputs
-                self._block_copy_paste = False
-                self._key_is_pressed = False
-
-            # User releases the mouse button or finger; don't consider the mouse
-            # wheel (button 4 & 5)
-            elif event.type == pygame.MOUSEBUTTONUP and self._mouse_enabled and \
-                    event.button in (1, 2, 3) or \
-                    event.type == FINGERUP and self._touchscreen_enabled and self._menu is not None:
-                event_pos = get_finger_pos(self._menu, event)
-                if rect.collidepoint(*event_pos) and \
-                        self.get_selected_time() > 1.5 * self._keyrepeat_mouse_interval_ms:
-                    self._selection_active = False
-                    self._check_mouse_collide_input(event_pos)
-                    self._cursor_ms_counter = 0
-                    self._cursor_visible = True
-
-            # User press the mouse button or finger; don't consider the mouse
-            # wheel (button 4 & 5)
-            elif event.type == pygame.MOUSEBUTTONDOWN and self._mouse_enabled and \
-                    event.button in (1, 2, 3) or \
-                    event.type == FINGERDOWN and self._touchscreen_enabled:
-                if self.get_selected_time() > self._keyrepeat_mouse_interval_ms or \
-                        hasattr(event, 'test'):
-                    if self._selection_active:
-                        self._unselect_text()
-                    self._cursor_ms_counter = 0
-                    self._cursor_visible = True
-                    self._selection_active = True
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self._selection_mouse_first_position = -1
-                    self.active = True
+        # Idle frame, nothing to process but the mouse repeat clock
+        if not events and not self._keyrepeat_counters and not mouse_left:
+            self._keyrepeat_mouse_ms += time_clock
+            return False
+
+        updated = False
+
+        # The modifiers state is updated when the events are pumped, thus, it is
+        # the same for all the events of the list
+        mods = pygame.key.get_mods()
+
+        for event in events:
+
+            # Check mouse over
+            self._check_mouseover(event, rect)
+
+            # Each handler returns if the widget was updated, and if the
+            # remaining events must be discarded
+            handler = self._event_handlers.get(event.type)
+            if handler is None:
+                continue
+            event_updated, stop = handler(event, rect, mods)
+            updated = updated or event_updated
+            if stop:
+                break
 
         # Update mouse
         self._keyrepeat_mouse_ms += time_clock
@@ -1893,21 +2349,21 @@ class TextInput(Widget):
                 self._check_mouse_collide_input((pos[0], pos[1]))
 
         # Update key counters:
-        for key in self._keyrepeat_counters:
-            self._keyrepeat_counters[key][0] += time_clock  # Update clock
+        counters = self._keyrepeat_counters
+        initial_interval = self._keyrepeat_initial_interval_ms
+        for key, counter in counters.items():
+            counter += time_clock  # Update clock
 
             # Generate new key events if enough time has passed:
-            if self._keyrepeat_counters[key][0] >= self._keyrepeat_initial_interval_ms:
-                self._keyrepeat_counters[key][0] = \
-                    self._keyrepeat_initial_interval_ms - self._keyrepeat_interval_ms
-
-                event_key, event_unicode = key, self._keyrepeat_counters[key][1]
+            if counter >= initial_interval:
+                counter = initial_interval - self._keyrepeat_interval_ms
                 self._add_event(
                     pygame.event.Event(
                         pygame.KEYDOWN,
-                        key=event_key,
-                        unicode=event_unicode)
+                        key=key,
+                        unicode=self._keyrepeat_unicode[key])
                 )
+            counters[key] = counter  # The keys do not change, only the values
 
         return updated
 
@@ -10,12 +10,16 @@ __all__ = ['TextInputWidgetTest']
 
 from test._utils import MenuUtils, surface, PygameEventUtils, TEST_THEME, PYGAME_V2, \
     BaseTest
+from unittest.mock import patch
 
 import pygame
 import pygame_menu
 import pygame_menu.controls as ctrl
 
 from pygame_menu.widgets.core.widget import WidgetTransformationNotImplemented
+from pygame_menu.widgets.widget.textinput import _font_size
+
+from pygame_menu._types import Tuple
 
 
 class TextInputWidgetTest(BaseTest):
@@ -382,6 +386,143 @@ class TextInputWidgetTest(BaseTest):
         textinput._history_index = len(textinput._history) - 1
         self.assertFalse(textinput._redo())
 
+    def test_undo_redo_removal(self) -> None:
+        """
+        Test undo/redo after removing the selected text, and after alt+x. The
+        history stores the cursor after each removal.
+        """
+        menu = MenuUtils.generic_menu()
+        textinput = menu.add.text_input('title')
+
+        def state() -> Tuple[str, int]:
+            return textinput.get_value(), textinput._cursor_position
+
+        # Select "bcd" from left to right
+        textinput.set_value('abcdef')
+        textinput.update(PygameEventUtils.key(pygame.K_HOME, keydown=True))
+        textinput.update(PygameEventUtils.key(pygame.K_RIGHT, keydown=True))
+        textinput.update(PygameEventUtils.key(pygame.K_LSHIFT, keydown=True))
+        for _ in range(3):
+            textinput.update(PygameEventUtils.key(pygame.K_RIGHT, keydown=True))
+        menu.draw(surface)  # Renders the selection
+        textinput.update(PygameEventUtils.key(pygame.K_LSHIFT, keyup=True))
+        self.assertEqual(textinput._selection_box, [1, 4])
+        self.assertEqual(textinput._cursor_position, 4)
+
+        # Remove the selection, and write a char
+        textinput.update(PygameEventUtils.key(pygame.K_BACKSPACE, keydown=True))
+        self.assertEqual(state(), ('aef', 1))
+        textinput.update(PygameEventUtils.key(pygame.K_z, keydown=True, char='z'))
+        self.assertEqual(state(), ('azef', 2))
+        textinput._undo()
+        self.assertEqual(state(), ('aef', 1))
+        textinput._undo()
+        self.assertEqual(state(), ('abcdef', 6))
+        textinput._redo()
+        self.assertEqual(state(), ('aef', 1))
+        textinput._redo()
+        self.assertEqual(state(), ('azef', 2))
+
+        # Alt+x removes the code, and then writes the char
+        textinput.set_value('hi')
+        textinput.update(PygameEventUtils.key(pygame.K_SPACE, keydown=True, char=' '))
+        for c in '215':
+            textinput.update(PygameEventUtils.key(ord(c), keydown=True, char=c))
+        self.assertEqual(state(), ('hi 215', 6))
+        textinput.update(PygameEventUtils.keydown_mod_alt(pygame.K_x))
+        PygameEventUtils.release_key_mod()
+        self.assertEqual(state(), ('hi\u0215', 3))
+        textinput._undo()
+        self.assertEqual(state(), ('hi', 2))
+        textinput._undo()
+        self.assertEqual(state(), ('hi 215', 6))
+        textinput._redo()
+        self.assertEqual(state(), ('hi', 2))
+        textinput._redo()
+        self.assertEqual(state(), ('hi\u0215', 3))
+
+        # Renderbox after removing the selection with maxwidth
+        def remove_selection(widget: 'pygame_menu.widgets.TextInput', text: str,
+                             right: int, chars: int) -> None:
+            for char in text:
+                widget.update(PygameEventUtils.key(ord(char), keydown=True, char=char))
+            key = pygame.K_LEFT
+            if right >= 0:  # Select to the right of the position, else, from the end
+                key = pygame.K_RIGHT
+                widget.update(PygameEventUtils.key(pygame.K_HOME, keydown=True))
+                for _ in range(right):
+                    widget.update(PygameEventUtils.key(pygame.K_RIGHT, keydown=True))
+            widget.update(PygameEventUtils.key(pygame.K_LSHIFT, keydown=True))
+            for _ in range(chars):
+                widget.update(PygameEventUtils.key(key, keydown=True))
+            menu.draw(surface)
+            widget.update(PygameEventUtils.key(pygame.K_LSHIFT, keyup=True))
+            widget.update(PygameEventUtils.key(pygame.K_BACKSPACE, keydown=True))
+
+        # The chars on the left of the cursor are removed, the box moves along
+        # with the chars after them, and the history stores the new box
+        textinput = menu.add.text_input('title', password=True, maxwidth=6)
+        remove_selection(textinput, 'abcdefghij', 6, 3)
+        self.assertEqual(state(), ('abcdefj', 6))
+        self.assertEqual(textinput._renderbox, [4, 6, 2])
+        textinput._undo()
+        self.assertEqual(textinput._renderbox, [5, 9, 4])
+        textinput._redo()
+        self.assertEqual(state(), ('abcdefj', 6))
+        self.assertEqual(textinput._renderbox, [4, 6, 2])
+
+        # The box shows the whole string if it fits
+        textinput = menu.add.text_input('title', input_underline='_', maxwidth=8)
+        remove_selection(textinput, 'abcdefghijkl', 7, 3)
+        self.assertEqual(state(), ('abcdefgkl', 7))
+        self.assertEqual(textinput._renderbox, [0, 9, 7])
+        textinput = menu.add.text_input('title', input_underline='_', maxwidth=8)
+        remove_selection(textinput, 'abcdefghijkl', -1, 4)
+        self.assertEqual(state(), ('abcdefgh', 8))
+        self.assertEqual(textinput._renderbox, [0, 8, 8])
+
+        # The dynamic maxwidth is fitted once after the removal
+        textinput = menu.add.text_input('title', maxwidth=10)
+        remove_selection(textinput, 'hello there world', -1, 4)
+        self.assertEqual(state(), ('hello there w', 13))
+        self.assertEqual(textinput._renderbox, [0, 13, 13])
+        self.assertEqual(textinput._maxwidth, 13)
+
+    def test_ctrl_commands(self) -> None:
+        """
+        Test the ctrl commands after a key press that updated the widget. Each
+        key press returns its own updated status, thus, the commands do not
+        depend on the previous events of the list.
+        """
+        menu = MenuUtils.generic_menu()
+        textinput = menu.add.text_input('title', default='ab')
+        rect = textinput.get_rect(to_real_position=True)
+
+        def keydown(event: 'pygame.event.Event', mods: int) -> Tuple[bool, bool]:
+            return textinput._handle_keydown(event, rect, mods)
+
+        key_c = PygameEventUtils.key(pygame.K_c, keydown=True, char='c', inlist=False)
+        self.assertEqual(keydown(key_c, pygame.KMOD_NONE), (True, False))
+        self.assertEqual(textinput.get_value(), 'abc')
+
+        # Ctrl+Z, Ctrl+Y
+        undo = PygameEventUtils.keydown_mod_ctrl(pygame.K_z, inlist=False)
+        self.assertEqual(keydown(undo, pygame.KMOD_CTRL), (True, True))
+        self.assertEqual(textinput.get_value(), 'ab')
+        redo = PygameEventUtils.keydown_mod_ctrl(pygame.K_y, inlist=False)
+        self.assertEqual(keydown(redo, pygame.KMOD_CTRL), (True, True))
+        self.assertEqual(textinput.get_value(), 'abc')
+
+        # Ctrl+A, Ctrl+X
+        self.assertEqual(keydown(key_c, pygame.KMOD_NONE), (True, False))
+        select_all = PygameEventUtils.keydown_mod_ctrl(pygame.K_a, inlist=False)
+        self.assertEqual(keydown(select_all, pygame.KMOD_CTRL), (True, True))
+        menu.draw(surface)
+        cut = PygameEventUtils.keydown_mod_ctrl(pygame.K_x, inlist=False)
+        self.assertEqual(keydown(cut, pygame.KMOD_CTRL), (True, True))
+        self.assertEqual(textinput.get_value(), '')
+        PygameEventUtils.release_key_mod()
+
     def test_copy_paste(self) -> None:
         """
         Test copy/paste.
@@ -425,6 +566,50 @@ class TextInputWidgetTest(BaseTest):
         textinput_copy._password = True
         self.assertFalse(textinput_copy._copy())
 
+    def test_paste_undo(self) -> None:
+        """
+        Test the undo of a paste with dynamic maxwidth, which restores the
+        renderbox fitted after the paste.
+        """
+        menu = MenuUtils.generic_menu()
+        textinput = menu.add.text_input('title', maxwidth=10)
+        for char in 'hello there':
+            textinput.update(PygameEventUtils.key(ord(char), keydown=True, char=char))
+        with patch('pygame_menu.widgets.widget.textinput.paste', return_value='W' * 13):
+            self.assertTrue(textinput._paste())
+        self.assertEqual(textinput._renderbox, [17, 24, 7])
+        self.assertEqual(textinput._maxwidth, 7)
+        textinput._block_copy_paste = False
+        with patch('pygame_menu.widgets.widget.textinput.paste', return_value='.'):
+            self.assertTrue(textinput._paste())
+        self.assertEqual(textinput._renderbox, [18, 25, 7])
+        textinput._undo()
+        self.assertEqual(textinput.get_value(), 'hello there' + 'W' * 13)
+        self.assertEqual(textinput._cursor_position, 24)
+        self.assertEqual(textinput._renderbox, [17, 24, 7])
+        textinput._redo()
+        self.assertEqual(textinput.get_value(), 'hello there' + 'W' * 13 + '.')
+        self.assertEqual(textinput._renderbox, [18, 25, 7])
+
+    def test_paste_maxwidth(self) -> None:
+        """
+        Test the renderbox after a paste with dynamic maxwidth.
+        """
+        menu = MenuUtils.generic_menu()
+        textinput = menu.add.text_input('title', maxwidth=7, maxchar=15)
+        for char in 'hello there':
+            textinput.update(PygameEventUtils.key(ord(char), keydown=True, char=char))
+        self.assertEqual(textinput._renderbox, [2, 11, 9])
+        self.assertEqual(textinput._maxwidth, 9)
+
+        # The box scrolls to the cursor, then the maxwidth is fitted once
+        with patch('pygame_menu.widgets.widget.textinput.paste', return_value='abc'):
+            self.assertTrue(textinput._paste())
+        self.assertEqual(textinput.get_value(), 'hello thereabc')
+        self.assertEqual(textinput._cursor_position, 14)
+        self.assertEqual(textinput._renderbox, [5, 14, 9])
+        self.assertEqual(textinput._maxwidth, 9)
+
     def test_overflow_removal(self) -> None:
         """
         Test text with max width and right overflow removal.
@@ -459,6 +644,174 @@ class TextInputWidgetTest(BaseTest):
         self.assertEqual(textinput._cursor_position, 25)
         self.assertEqual(textinput._renderbox, [0, 25, 25])
 
+    def test_set_value_maxwidth(self) -> None:
+        """
+        Test the renderbox after setting the value with a dynamic max width. It
+        is computed from the final text, with the cursor at the end.
+        """
+        menu = MenuUtils.generic_menu()
+        textinput = menu.add.text_input('title', maxwidth=4)
+        textinput.set_value('-W1b')
+        self.assertEqual(textinput._cursor_position, 4)
+        self.assertEqual(textinput._renderbox, [0, 4, 4])
+        self.assertEqual(textinput._maxwidth, 4)
+        textinput.set_value('a' * 10)
+        self.assertEqual(textinput._cursor_position, 10)
+        self.assertEqual(textinput._renderbox, [7, 10, 3])
+        self.assertEqual(textinput._maxwidth, 3)
+
+    def test_cursor_position(self) -> None:
+        """
+        Test the cursor position with chars whose advance within a string differs
+        from their size alone.
+        """
+        menu = MenuUtils.generic_menu()
+        textinput = menu.add.text_input('N: ')
+        font = textinput._font
+        for text in ('f' * 30, 'ij' * 15, 'Wf-' * 10):
+            textinput.set_value(text)
+            textinput.draw(surface)
+            self.assertEqual(textinput._cursor_position, len(text))
+            self.assertEqual(textinput._cursor_surface_pos[0],
+                             textinput._cursor_offset + font.size('N: ' + text)[0]
+                             - textinput._cursor_surface.get_width() + 2)
+
+    def test_cursor_mouse(self) -> None:
+        """
+        Test the cursor position after a click on a long string.
+        """
+        menu = MenuUtils.generic_menu()
+        textinput = menu.add.text_input('N: ')
+        font = textinput._font
+        textinput.set_value('f' * 30)
+
+        # Click at the start of each char, the last one is not split by half
+        for i in (0, 5, 15, 25):
+            textinput._update_cursor_mouse(font.size('N: ' + 'f' * i)[0] + 1)
+            self.assertEqual(textinput._cursor_position, i)
+
+        # Click on the title, and after the text
+        textinput._update_cursor_mouse(0)
+        self.assertEqual(textinput._cursor_position, 0)
+        textinput._update_cursor_mouse(font.size('N: ' + 'f' * 30)[0] + 10)
+        self.assertEqual(textinput._cursor_position, 30)
+
+        # A wide char followed by slim ones
+        textinput.set_value('W' + 'i' * 10)
+        for i in range(10):
+            textinput._update_cursor_mouse(font.size('N: ' + ('W' + 'i' * 10)[:i])[0] + 1)
+            self.assertEqual(textinput._cursor_position, i)
+
+        # The prefixes are not stored within the shared font size cache
+        textinput.set_value('j' * 40)
+        cache_size = _font_size.cache_info().currsize
+        textinput._update_cursor_mouse(font.size('N: ' + 'j' * 20)[0] + 1)
+        self.assertEqual(textinput._cursor_position, 20)
+        self.assertEqual(_font_size.cache_info().currsize, cache_size)
+
+    def test_controller(self) -> None:
+        """
+        Test the key press events with modified controllers.
+        """
+        menu = MenuUtils.generic_menu()
+        textinput = menu.add.text_input('title', default='abcd')
+        self.assertEqual(textinput._cursor_position, 4)
+
+        def f1_back(event, _) -> bool:
+            return event.key == pygame.K_F1
+
+        # Event overridden within the Controller class, it applies once the
+        # controller is set
+        default_back = ctrl.Controller.back
+        ctrl.Controller.back = lambda self, event, widget: f1_back(event, widget)
+        try:
+            textinput.update(PygameEventUtils.key(pygame.K_F1, keydown=True, char=''))
+            self.assertEqual(textinput.get_value(), 'abcd')
+            textinput.set_controller(ctrl.Controller())
+            textinput.update(PygameEventUtils.key(pygame.K_F1, keydown=True, char=''))
+            self.assertEqual(textinput.get_value(), 'abc')
+            textinput.update(PygameEventUtils.key(pygame.K_BACKSPACE, keydown=True, char=''))
+            self.assertEqual(textinput.get_value(), 'abc')
+        finally:
+            ctrl.Controller.back = default_back
+        textinput.set_controller(ctrl.Controller())
+        textinput.update(PygameEventUtils.key(pygame.K_BACKSPACE, keydown=True, char=''))
+        self.assertEqual(textinput.get_value(), 'ab')
+
+        # Event overridden within the controller object
+        controller = ctrl.Controller()
+        controller.back = f1_back
+        textinput.set_controller(controller)
+        textinput.update(PygameEventUtils.key(pygame.K_F1, keydown=True, char=''))
+        self.assertEqual(textinput.get_value(), 'a')
+        textinput.set_controller(ctrl.Controller())
+
+        # Modified key constants, these apply once the widget receives the focus
+        textinput.set_value('abcd')
+        default_key_back, default_key_left = ctrl.KEY_BACK, ctrl.KEY_LEFT
+        ctrl.KEY_BACK, ctrl.KEY_LEFT = pygame.K_F2, pygame.K_F3
+        try:
+            textinput.update(PygameEventUtils.key(pygame.K_F2, keydown=True, char=''))
+            self.assertEqual(textinput.get_value(), 'abcd')
+            textinput.select()
+            textinput.update(PygameEventUtils.key(pygame.K_F2, keydown=True, char=''))
+            self.assertEqual(textinput.get_value(), 'abc')
+            textinput.update(PygameEventUtils.key(pygame.K_F3, keydown=True, char=''))
+            self.assertEqual(textinput._cursor_position, 2)
+            textinput.update(PygameEventUtils.key(pygame.K_BACKSPACE, keydown=True, char=''))
+            self.assertEqual(textinput.get_value(), 'abc')
+        finally:
+            ctrl.KEY_BACK, ctrl.KEY_LEFT = default_key_back, default_key_left
+        textinput.select()
+        textinput.update(PygameEventUtils.key(pygame.K_BACKSPACE, keydown=True, char=''))
+        self.assertEqual(textinput.get_value(), 'ac')
+
+    def test_tab(self) -> None:
+        """
+        Test the tab key, which inserts the spaces at once.
+        """
+        menu = MenuUtils.generic_menu()
+        tab = PygameEventUtils.key(pygame.K_TAB, keydown=True)
+
+        # Tab is cut to the available chars
+        textinput = menu.add.text_input('title', maxchar=6, default='abc')
+        self.assertEqual(textinput._tab_size, 4)
+        self.assertTrue(textinput.update(tab))
+        self.assertEqual(textinput.get_value(), 'abc   ')
+        self.assertEqual(textinput._cursor_position, 6)
+        textinput.update(tab)
+        self.assertEqual(textinput.get_value(), 'abc   ')
+
+        # A single undo removes the whole tab
+        textinput._undo()
+        self.assertEqual(textinput.get_value(), 'abc')
+        self.assertEqual(textinput._cursor_position, 3)
+        textinput._redo()
+        self.assertEqual(textinput.get_value(), 'abc   ')
+
+        # Tab within the string
+        textinput = menu.add.text_input('title', default='abc')
+        textinput._cursor_position = 1
+        textinput.update(tab)
+        self.assertEqual(textinput.get_value(), 'a    bc')
+        self.assertEqual(textinput._cursor_position, 5)
+        textinput._undo()
+        self.assertEqual(textinput.get_value(), 'abc')
+
+        # Tab scrolls the renderbox
+        textinput = menu.add.text_input('title', maxwidth=5, default='abc',
+                                        maxwidth_dynamically_update=False)
+        self.assertEqual(textinput._renderbox, [0, 3, 3])
+        textinput.update(tab)
+        self.assertEqual(textinput.get_value(), 'abc    ')
+        self.assertEqual(textinput._cursor_position, 7)
+        self.assertEqual(textinput._renderbox, [2, 7, 5])
+
+        # Spaces are not valid
+        textinput = menu.add.text_input('title', valid_chars=['a', 'b'], default='ab')
+        textinput.update(tab)
+        self.assertEqual(textinput.get_value(), 'ab')
+
     # noinspection PyTypeChecker
     def test_textinput_underline(self) -> None:
         """